@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Fake gog CLI for the fetch harness.
+Answers `gog calendar events <calendar> ... --json` from bench/fixtures/gog
+(only today's events for --today), with the fault configured in
+DOBBY_HARNESS_GOG, and logs every call.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fetch_harness import FIXTURES_DIR, HANG_SECONDS, load_fixture, slug
+
+def main():
+    args = sys.argv[1:]
+    fault = json.loads(os.environ.get("DOBBY_HARNESS_GOG") or "{}")
+    calendar = args[2] if len(args) > 2 and args[:2] == ["calendar", "events"] else None
+
+    calls_file = os.environ.get("DOBBY_HARNESS_CALLS")
+    if calls_file:
+        with open(calls_file, "a") as f:
+            f.write(json.dumps({"source": "gog", "calendar": calendar, "args": args}) + "\n")
+
+    if fault.get("latency"):
+        time.sleep(fault["latency"])
+    if fault.get("timeout"):
+        time.sleep(HANG_SECONDS)
+    if fault.get("error"):
+        print(f"gog: calendar API error ({fault['error']})", file=sys.stderr)
+        sys.exit(1)
+    if fault.get("empty") or calendar is None:
+        return
+
+    fixtures = os.environ.get("DOBBY_HARNESS_FIXTURES", FIXTURES_DIR)
+    path = os.path.join(fixtures, "gog", f"{slug(calendar)}.json")
+    data = load_fixture(path) if os.path.exists(path) else {"events": []}
+    if "--today" in args:
+        today = datetime.now().strftime("%Y-%m-%d")
+        data["events"] = [e for e in data.get("events", [])
+                          if e.get("start", {}).get("dateTime", "").startswith(today)]
+    print(json.dumps(data))
+
+if __name__ == "__main__":
+    main()
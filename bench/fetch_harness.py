@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Fetch Pipeline Harness
+Runs fetch_data.py end to end (build_snapshot -> build_quickglance + popup check)
+against local stand-ins, so it can be timed offline and replayed exactly:
+
+- a fake `gog` on PATH answering from bench/fixtures/gog
+- a local HTTP server standing in for Todoist and wttr.in (bench/fixtures)
+
+Fixture times are relative ({now+10m}, {today+1d}), so a replay always sees the
+same schedule. Faults are injected per service:
+
+    python3 bench/fetch_harness.py --runs 3
+    python3 bench/fetch_harness.py --fault weather=error:503 --fault gog=latency:2
+    python3 bench/fetch_harness.py --fault todoist=timeout --deadline 3 -o slow-todoist.json
+
+Reports wall time per phase, calls per source and how each source was resolved
+(fetched, cache hit, or a fallback to the cached/default value).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+# A "timeout" fault hangs this long - longer than any client timeout or fetch deadline
+HANG_SECONDS = 120
+
+SERVICES = ("gog", "todoist", "weather")
+PLACEHOLDER = re.compile(r"\{(now|today)((?:[+-]\d+[mhd])*)\}")
+OFFSET = re.compile(r"([+-]\d+)([mhd])")
+UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+def slug(name):
+    """Fixture file name for a calendar ("Me and You" -> me-and-you)"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+def _expand(match):
+    """{now+90m} -> a dateTime like gog's, {today+1d} -> a date"""
+    when = datetime.now().replace(microsecond=0)
+    for amount, unit in OFFSET.findall(match.group(2)):
+        when += timedelta(**{UNITS[unit]: int(amount)})
+    if match.group(1) == "today":
+        return when.strftime("%Y-%m-%d")
+    return when.strftime("%Y-%m-%dT%H:%M:%S-06:00")
+
+def expand(value):
+    """Resolve relative time placeholders anywhere in a fixture"""
+    if isinstance(value, str):
+        return PLACEHOLDER.sub(_expand, value)
+    if isinstance(value, list):
+        return [expand(v) for v in value]
+    if isinstance(value, dict):
+        return {k: expand(v) for k, v in value.items()}
+    return value
+
+def load_fixture(path):
+    with open(path) as f:
+        return expand(json.load(f))
+
+def parse_faults(specs):
+    """--fault service=kind[:value] -> {service: {kind: value}}"""
+    faults = {service: {} for service in SERVICES}
+    for spec in specs or []:
+        service, _, rule = spec.partition("=")
+        kind, _, value = rule.partition(":")
+        if service not in SERVICES or kind not in ("latency", "error", "timeout", "empty"):
+            raise SystemExit(f"Bad --fault {spec!r}: use <{'|'.join(SERVICES)}>=latency:<s>|error[:<status>]|timeout|empty")
+        if kind == "latency":
+            faults[service][kind] = float(value)
+        elif kind == "error":
+            faults[service][kind] = int(value) if value else 500
+        else:
+            faults[service][kind] = True
+    return faults
+
+class StandIn:
+    """Local HTTP server answering Todoist and wttr.in requests from fixtures"""
+
+    def __init__(self, fixtures, faults):
+        self.fixtures = fixtures
+        self.faults = faults
+        self.calls = []
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="stand-in", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, path, query):
+        """(service, endpoint, body) for a request path"""
+        if path.startswith("/todoist/projects"):
+            return "todoist", "projects", load_fixture(os.path.join(self.fixtures, "todoist", "projects.json"))
+        if path.startswith("/todoist/tasks"):
+            tasks = load_fixture(os.path.join(self.fixtures, "todoist", "tasks.json"))
+            return "todoist", "tasks", tasks.get(query.get("project_id", [""])[0], [])
+        if path.startswith("/weather"):
+            return "weather", "forecast", load_fixture(os.path.join(self.fixtures, "wttr.json"))
+        return None, path, None
+
+    def handle(self, request):
+        url = urlparse(request.path)
+        service, endpoint, body = self.route(url.path, parse_qs(url.query))
+        with self.lock:
+            self.calls.append({"source": service, "endpoint": endpoint})
+        fault = self.faults.get(service, {})
+        if fault.get("latency"):
+            time.sleep(fault["latency"])
+        if fault.get("timeout"):
+            time.sleep(HANG_SECONDS)
+            return
+        status = fault.get("error") or (200 if service else 404)
+        payload = b"" if fault.get("empty") else json.dumps(body if status == 200 else {"error": status}).encode()
+        try:
+            request.send_response(status)
+            request.send_header("Content-Type", "application/json")
+            request.send_header("Content-Length", str(len(payload)))
+            request.end_headers()
+            request.wfile.write(payload)
+        except OSError:
+            pass  # the client gave up first
+
+    def take_calls(self):
+        with self.lock:
+            calls, self.calls = self.calls, []
+        return calls
+
+def prepare(workdir, fixtures, faults, stand_in):
+    """Fake gog on PATH plus fetch_data pointed at the stand-ins; must run before importing fetch_data"""
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir)
+    gog = os.path.join(bin_dir, "gog")
+    with open(gog, "w") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(BENCH_DIR, "fake_gog.py")}" "$@"\n')
+    os.chmod(gog, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["DOBBY_HARNESS_GOG"] = json.dumps(faults["gog"])
+    os.environ["DOBBY_HARNESS_CALLS"] = os.path.join(workdir, "gog_calls.jsonl")
+    os.environ["DOBBY_HARNESS_FIXTURES"] = fixtures
+    os.environ["DOBBY_TODOIST_API"] = f"{stand_in.url}/todoist"
+    os.environ["DOBBY_WEATHER_URL"] = f"{stand_in.url}/weather/Fultondale+AL"
+    os.environ["TODOIST_API_TOKEN"] = "harness-token"
+
+    sys.path.insert(0, ROOT)
+    import fetch_data
+    fetch_data.CACHE_FILE = os.path.join(workdir, "events_cache.json")
+    return fetch_data
+
+def take_gog_calls(workdir):
+    path = os.path.join(workdir, "gog_calls.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        calls = [json.loads(line) for line in f if line.strip()]
+    os.remove(path)
+    return calls
+
+def count_calls(gog_calls, http_calls):
+    """Calls per source, e.g. {"gog": {"Me and You": 1}, "todoist": {"projects": 1, "tasks": 2}}"""
+    counts = {service: {} for service in SERVICES}
+    for call in gog_calls:
+        key = call.get("calendar") or "other"
+        counts["gog"][key] = counts["gog"].get(key, 0) + 1
+    for call in http_calls:
+        service = call["source"] or "unknown"
+        bucket = counts.setdefault(service, {})
+        bucket[call["endpoint"]] = bucket.get(call["endpoint"], 0) + 1
+    return counts
+
+def resolve_sources(names, cached_before, started, fetched, errors, gog_failed):
+    """How each source got its value this run, from what the recording wrappers saw"""
+    outcomes = {}
+    for name in names:
+        if name in fetched:
+            # get_upcoming_events swallows gog failures and returns its stored events
+            outcomes[name] = "fetched (gog failed, used stored events)" if name in gog_failed else "fetched"
+        elif name in started:
+            reason = "error" if name in errors else "missed deadline"
+            outcomes[name] = f"fallback ({reason}): " + ("cached value" if name in cached_before else "default")
+        else:
+            outcomes[name] = "cache hit"
+    return outcomes
+
+def run_once(fetch_data, stand_in, workdir, deadline, use_cache):
+    """One fetch run; returns its report"""
+    cached_before = set(fetch_data._cached_sources())
+    started, stored, errors, gog_failed = set(), set(), {}, set()
+    real_run, real_store, real_gog = fetch_data._run_source, fetch_data._store_source, fetch_data.gog_events
+
+    def recording_run(name, fetch, results):
+        started.add(name)
+        def recorded_fetch():
+            try:
+                return fetch()
+            except Exception as e:
+                errors[name] = str(e)
+                raise
+        real_run(name, recorded_fetch, results)
+
+    def recording_store(name, value):
+        stored.add(name)
+        real_store(name, value)
+
+    def recording_gog(calendar_name, *window):
+        try:
+            return real_gog(calendar_name, *window)
+        except Exception:
+            gog_failed.add(f"calendar:{calendar_name}")
+            raise
+
+    fetch_data._run_source = recording_run
+    fetch_data._store_source = recording_store
+    fetch_data.gog_events = recording_gog
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            start = time.perf_counter()
+            snapshot = fetch_data.build_snapshot(use_cache=use_cache, deadline=deadline)
+            snapshot_done = time.perf_counter()
+            # Only what landed before the deadline counts as fetched in this run
+            fetched_in_run, failed_in_run = set(stored), set(gog_failed)
+            quickglance = fetch_data.build_quickglance(snapshot)
+            quickglance_done = time.perf_counter()
+            should_popup, popup = fetch_data.check_popup_routines(snapshot)
+            end = time.perf_counter()
+            # Background revalidations aren't part of the run's wall time, but their calls are counted
+            fetch_data.wait_for_refreshes(timeout=deadline)
+    finally:
+        fetch_data._run_source, fetch_data._store_source, fetch_data.gog_events = real_run, real_store, real_gog
+
+    log = [line for line in out.getvalue().splitlines() if line.strip()]
+    names = ["dinner", "weather", "tasks"] + [f"calendar:{c}" for c in snapshot["calendars"]]
+    return {
+        "wall_ms": round((end - start) * 1000, 1),
+        "phases_ms": {
+            "snapshot": round((snapshot_done - start) * 1000, 1),
+            "quickglance": round((quickglance_done - snapshot_done) * 1000, 1),
+            "popup_check": round((end - quickglance_done) * 1000, 1),
+        },
+        "calls": count_calls(take_gog_calls(workdir), stand_in.take_calls()),
+        "sources": resolve_sources(names, cached_before, started, fetched_in_run, errors, failed_in_run),
+        "refreshed_in_background": sorted(stored - fetched_in_run),
+        "popup": popup if should_popup else None,
+        "quickglance": {k: quickglance.get(k) for k in ("current_event", "next_event", "countdown",
+                                                        "dinner", "weather_temp")},
+        "log": log,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the fetch pipeline against local stand-ins")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Fixture directory")
+    parser.add_argument("--fault", action="append", metavar="SERVICE=KIND[:VALUE]",
+                        help="gog|todoist|weather = latency:<s> | error[:<status>] | timeout | empty (repeatable)")
+    parser.add_argument("--runs", type=int, default=2, help="Runs in a row (the first starts with an empty cache)")
+    parser.add_argument("--deadline", type=float, default=5, help="Fetch deadline in seconds (FETCH_DEADLINE)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore source TTLs on every run")
+    parser.add_argument("--output", "-o", help="Write the report JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    faults = parse_faults(args.fault)
+    workdir = tempfile.mkdtemp(prefix="dobby-harness-")
+    stand_in = StandIn(args.fixtures, faults).start()
+    try:
+        fetch_data = prepare(workdir, args.fixtures, faults, stand_in)
+        runs = []
+        for i in range(args.runs):
+            report = run_once(fetch_data, stand_in, workdir, args.deadline, use_cache=not args.refresh)
+            runs.append(report)
+            print(f"run {i + 1}: {report['wall_ms']} ms  sources={report['sources']}", file=sys.stderr)
+    finally:
+        stand_in.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "meta": {"timestamp": datetime.now().isoformat(), "faults": faults, "deadline": args.deadline,
+                 "refresh": args.refresh, "fixtures": os.path.relpath(args.fixtures, ROOT)},
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(result, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
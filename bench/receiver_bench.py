@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Receiver Benchmarks
+Latency and throughput of the receiver's endpoints through Flask's test client
+(no network, no server), plus render time for every display mode.
+
+Results are written as JSON so runs can be compared:
+
+    python3 bench/receiver_bench.py --output before.json
+    # ...change something...
+    python3 bench/receiver_bench.py --output after.json --compare before.json
+"""
+
+import argparse
+import importlib.metadata
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The receiver restores its snapshot and registers an atexit save on import, so its
+# snapshot and config files have to point at a temp dir before the import, not after
+WORK_DIR = tempfile.mkdtemp(prefix="dobby-bench-")
+os.environ["DOBBY_STATE_FILE"] = os.path.join(WORK_DIR, "display_state.json")
+os.environ["DOBBY_CONFIG_FILE"] = os.path.join(WORK_DIR, "config.json")
+
+import flask
+import receiver
+
+# Realistic content for each display mode (what fetch_data.py / push.py send)
+QUICKGLANCE = {
+    "time": "7:42", "date": "Saturday, Feb 14",
+    "countdown": "Church in 1h 18m", "countdown_label": "Leave by 9:45", "countdown_urgency": "normal",
+    "current_event": "Breakfast", "current_event_time": "7:30 AM", "current_location": "Home",
+    "next_event": "Church", "next_event_time": "10:00 AM", "next_location": "Grace Chapel",
+    "weather_icon": "⛅", "weather_temp": "54°", "weather_high": "61", "weather_low": "42",
+    "dinner": "Chicken tacos",
+    "tasks": [{"name": "Pay water bill", "due": "Today"}, {"name": "Return library books", "due": "Mon"},
+              {"name": "Soccer snacks", "due": "Sat"}, {"name": "Call grandma", "due": None},
+              {"name": "Schedule dentist", "due": "Feb 20"}],
+}
+
+MODE_PAYLOADS = {
+    "quickglance": ("Quick Look", QUICKGLANCE),
+    "dashboard": ("Family Dashboard", {"date": "Saturday, Feb 14", "tasks": 4}),
+    "run": ("🏃 Latest Run", {"distance": "5.2 mi", "time": "44:12", "pace": "8:30 /mi",
+                             "avg_hr": "152", "calories": "612", "elevation": "210 ft"}),
+    "meals": ("🍽️ This Week's Meals", {"monday": "Spaghetti", "tuesday": "Tacos", "wednesday": "Stir fry",
+                                        "thursday": "Soup & grilled cheese", "friday": "Pizza night",
+                                        "saturday": "Burgers", "sunday": "Roast chicken",
+                                        "shopping": "Milk, eggs, tortillas, basil"}),
+    "routine": ("Bedtime Routine", {"steps": ["Bath", "Pajamas", "Brush teeth", "Pick a book",
+                                              "Story time", "Lights out"]}),
+    "weather": ("Weather", {"temp": "54°F", "description": "Partly cloudy", "icon": "⛅",
+                            "nudge": "Grab a jacket for church", "time": "7:42 AM"}),
+    "celebration": ("Celebration", {"title": "Happy Birthday!", "name": "Grandma", "age": "80",
+                                    "icon": "🎂", "message": "Party at 3pm",
+                                    "celebrations": [{"name": "Grandma", "age": "80", "date": "Feb 14"},
+                                                     {"name": "Uncle Joe", "age": "45", "date": "Feb 16"}]}),
+    "countdown": ("Countdown", {"event": "Church", "days": None, "hours": 1, "minutes": 18, "seconds": 0,
+                                "message": "Leave by 9:45", "type": "countdown", "auto_dismiss": 0}),
+    "message": ("Message", {"message": "Dinner is ready!", "sub_message": "Wash your hands",
+                            "font_size": "4rem", "sub_size": "2rem", "auto_dismiss": 30, "type": "info",
+                            "color": "#667eea", "sticky": False, "speak": "", "queue_id": 1}),
+    "verse": ("Verse", {"type": "verse", "text": "This is the day that the Lord has made; "
+                                                 "let us rejoice and be glad in it.",
+                        "reference": "Psalm 118:24", "label": "Verse of the Day"}),
+    "alert": ("Alert", {"title": "Wind Advisory", "severity": "warning", "icon": "💨",
+                        "message": "Gusts up to 45 mph this afternoon",
+                        "details": ["Secure trash cans", "Bring in patio cushions"],
+                        "action": "Until 6 PM", "time": "7:40 AM"}),
+    "custom": ("Dobby", {"text": "Remember: early pickup today at 12:30!"}),
+}
+
+def isolate():
+    """Quiet the receiver's logging (its files already point at WORK_DIR)"""
+    logging.getLogger("receiver").setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+def percentile(sorted_samples, p):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_samples[min(len(sorted_samples) - 1, round(p / 100 * (len(sorted_samples) - 1)))]
+
+def summarize(samples):
+    """Latency stats in ms (and calls/s) for a list of durations in seconds"""
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(total / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "per_second": round(len(samples) / total, 1) if total else None,
+    }
+
+def measure(call, iterations, warmup, setup=None):
+    """Time call() iterations times; setup() runs before each call, outside the timing"""
+    samples = []
+    for i in range(warmup + iterations):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        call(i)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+def expect(resp, *codes):
+    """Fail loudly instead of benchmarking an error page"""
+    if resp.status_code not in codes:
+        raise RuntimeError(f"{resp.request.method} {resp.request.path} -> {resp.status_code}: "
+                           f"{resp.get_data(as_text=True)[:200]}")
+    return resp
+
+def reset_to_quickglance(client):
+    """Known starting state: empty message queue, quickglance content on screen"""
+    with receiver.state_changed:
+        receiver.message_queue.clear()
+    expect(client.post("/api/clear-message", json={}), 200)
+    expect(client.post("/api/update", json={"mode": "quickglance", "title": "Quick Look",
+                                            "content": QUICKGLANCE}), 200)
+
+def bench_endpoints(client, iterations, warmup):
+    """Latency of the endpoints the tablet and the pushers hit"""
+    results = {}
+    reset_to_quickglance(client)
+
+    results["GET /"] = measure(lambda i: expect(client.get("/"), 200), iterations, warmup)
+    results["GET / (render)"] = measure(lambda i: expect(client.get("/"), 200), iterations, warmup,
+                                        setup=lambda i: receiver.invalidate_pages())
+    etag = client.get("/").headers["ETag"]
+    results["GET / (304)"] = measure(lambda i: expect(client.get("/", headers={"If-None-Match": etag}), 304),
+                                     iterations, warmup)
+    results["GET /api/status"] = measure(lambda i: expect(client.get("/api/status"), 200), iterations, warmup)
+
+    def update(i):
+        content = {**QUICKGLANCE, "time": f"7:{i % 60:02d}", "dinner": f"Tacos #{i}"}
+        expect(client.post("/api/update", json={"mode": "quickglance", "title": "Quick Look",
+                                                "content": content}), 200)
+    results["POST /api/update"] = measure(update, iterations, warmup)
+
+    message = {"message": "Dinner is ready!", "sub_message": "Wash your hands", "type": "info", "auto_dismiss": 0}
+    clear = lambda i: expect(client.post("/api/clear-message", json={}), 200)
+    results["POST /api/message"] = measure(lambda i: expect(client.post("/api/message", json=message), 200),
+                                           iterations, warmup, setup=clear)
+    results["POST /api/clear-message"] = measure(
+        clear, iterations, warmup,
+        setup=lambda i: expect(client.post("/api/message", json=message), 200))
+
+    reset_to_quickglance(client)
+    return results
+
+def bench_render(iterations, warmup):
+    """Full display.html render time per mode, bypassing the page cache"""
+    results = {}
+    updated = (datetime.now() - timedelta(minutes=3)).isoformat()
+    with receiver.app.test_request_context("/"):
+        for mode, (title, content) in MODE_PAYLOADS.items():
+            state = {"mode": mode, "title": title, "content": content, "updated": updated}
+            render = lambda i: flask.render_template("display.html", state=state,
+                                                     config=receiver.config, version=i)
+            results[mode] = measure(render, iterations, warmup)
+            results[mode]["bytes"] = len(render(0).encode())
+    return results
+
+def metadata(iterations):
+    """Enough context to tell whether two runs are comparable"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "iterations": iterations,
+        "python": platform.python_version(),
+        "flask": importlib.metadata.version("flask"),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+def compare(old, new):
+    """Print p50/p99 changes between two result files"""
+    print(f"\nvs {old['meta'].get('commit')} ({old['meta'].get('timestamp')})")
+    for section in ("endpoints", "render"):
+        for name, stats in new.get(section, {}).items():
+            before = old.get(section, {}).get(name)
+            if not before:
+                continue
+            deltas = []
+            for key in ("p50_ms", "p99_ms"):
+                change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0
+                deltas.append(f"{key[:-3]} {before[key]:.3f} -> {stats[key]:.3f} ms ({change:+.0f}%)")
+            print(f"  {section}/{name:<24} " + "  ".join(deltas))
+
+def print_table(title, results):
+    """Human-readable summary (stderr, so stdout can carry the JSON)"""
+    print(f"\n{title}", file=sys.stderr)
+    print(f"  {'':<26}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'per s':>9}", file=sys.stderr)
+    for name, s in results.items():
+        print(f"  {name:<26}{s['p50_ms']:>9.3f}{s['p99_ms']:>9.3f}{s['max_ms']:>9.3f}{s['per_second']:>9.0f}",
+              file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark receiver endpoints and template rendering")
+    parser.add_argument("--iterations", "-n", type=int, default=500, help="Timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls before each benchmark")
+    parser.add_argument("--output", "-o", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--only", choices=["endpoints", "render"], help="Run just one section")
+    args = parser.parse_args()
+
+    isolate()
+    receiver.compile_templates()
+    results = {"meta": metadata(args.iterations)}
+    if args.only != "render":
+        results["endpoints"] = bench_endpoints(receiver.app.test_client(), args.iterations, args.warmup)
+        print_table("Endpoints", results["endpoints"])
+    if args.only != "endpoints":
+        results["render"] = bench_render(args.iterations, args.warmup)
+        print_table("Render (display.html per mode)", results["render"])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,21 @@ import os
 import sys
 
 # Fix PATH for cron jobs - include home bin where gog lives
-os.environ["PATH"] = os.environ.get("PATH", "") + ":/home/ccampos/bin:/usr/local/bin"
+# (only what's missing: the receiver imports this too, and re-execs itself on /api/restart)
+_path = os.environ.get("PATH", "").split(os.pathsep)
+os.environ["PATH"] = os.pathsep.join(_path + [d for d in ("/home/ccampos/bin", "/usr/local/bin") if d not in _path])
 
+import bisect
+import hashlib
 import json
+import queue
+import signal
 import subprocess
-import requests
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 import yaml
+import http_client
 
 # Load secrets if available
 secrets_path = os.path.expanduser("~/.openclaw/.secrets/todoist.env")
@@ -26,16 +34,39 @@ if os.path.exists(secrets_path):
                 os.environ.setdefault(key, val)
 
 # Config
-DISPLAY_URL = os.environ.get("DOBBY_DISPLAY_URL", "http://100.76.87.63:5000")
+# API endpoints (overridable so the bench harness can point them at local stand-ins)
+TODOIST_API = os.environ.get("DOBBY_TODOIST_API", "https://api.todoist.com/api/v2")
+WEATHER_URL = os.environ.get("DOBBY_WEATHER_URL", "https://wttr.in/Fultondale+AL")
+# Comma-separated to push to several displays at once
+DISPLAY_URLS = [u.strip() for u in os.environ.get("DOBBY_DISPLAY_URL", "http://100.76.87.63:5000").split(",")
+                if u.strip()]
+# Seconds each display gets to answer a push; a slow or offline one doesn't hold up the rest
+DISPLAY_TIMEOUT = float(os.environ.get("DOBBY_DISPLAY_TIMEOUT", "10"))
 TODOIST_TOKEN = os.environ.get("TODOIST_API_TOKEN", "79267f117496088bbc215416cb4c355893432553")
 CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
 CACHE_FILE = os.path.join(CACHE_DIR, "events_cache.json")
 
+# Overall deadline for one fetch run - sources still running after this use their last good value
+FETCH_DEADLINE = float(os.environ.get("DOBBY_FETCH_DEADLINE", "20"))
+# Seconds a gog call may take; kept under FETCH_DEADLINE so a hung call ends before the next run
+GOG_TIMEOUT = min(15.0, FETCH_DEADLINE * 0.75)
+# Seconds between full calendar resyncs; runs in between only pull today's events
+CALENDAR_RESYNC = float(os.environ.get("DOBBY_CALENDAR_RESYNC", "3600"))
+
+# Sources write to the cache file concurrently, so read-modify-write goes through this lock
+_cache_lock = threading.Lock()
+
+# Daemon mode serves the cache from memory and persists it at most once per tick (see flush_cache)
+_resident_cache = None
+_cache_dirty = False
+
 # Ensure cache directory exists
 os.makedirs(CACHE_DIR, exist_ok=True)
 
 def load_cache():
-    """Load cached events from file"""
+    """Load cached events (from memory in daemon mode, otherwise from file)"""
+    if _resident_cache is not None:
+        return _resident_cache
     try:
         if os.path.exists(CACHE_FILE):
             with open(CACHE_FILE, "r") as f:
@@ -44,151 +75,197 @@ def load_cache():
         pass
     return {"events": [], "timestamp": None}
 
-def save_cache(events):
-    """Save events to cache file"""
+def save_cache(cache):
+    """Save cache dict to cache file (in daemon mode, just mark it for the next flush)"""
+    global _resident_cache, _cache_dirty
+    if _resident_cache is not None:
+        _resident_cache = cache
+        _cache_dirty = True
+        return
+    _write_cache(cache)
+
+def _write_cache(cache):
+    """Write the cache file atomically (temp file + rename).
+    
+    The receiver's warm fetch, cron runs and refresh threads all share the file,
+    so a reader must never see it half written.
+    """
+    tmp_path = f"{CACHE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump({"events": events, "timestamp": datetime.now().isoformat()}, f)
-    except:
-        pass
+        with open(tmp_path, "w") as f:
+            json.dump({**cache, "timestamp": datetime.now().isoformat()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CACHE_FILE)
+    except Exception as e:
+        # Report it (e.g. a value that isn't JSON) instead of writing a stringified copy
+        print(f"Cache save error: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def update_cache(**entries):
+    """Merge entries into the cache file without clobbering concurrent writers"""
+    with _cache_lock:
+        cache = load_cache()
+        cache.update(entries)
+        save_cache(cache)
+
+def keep_cache_in_memory():
+    """Daemon mode: read the cache file once and keep it in memory from then on.
+    
+    Writes from other processes after this point aren't seen; the daemon is
+    the one keeping the cache fresh.
+    """
+    global _resident_cache
+    with _cache_lock:
+        _resident_cache = load_cache()
+
+def flush_cache():
+    """Persist the in-memory cache if anything changed since the last flush"""
+    global _cache_dirty
+    with _cache_lock:
+        if _resident_cache is None or not _cache_dirty:
+            return
+        _write_cache(_resident_cache)
+        _cache_dirty = False
+
 CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Central timezone offset
 CENTRAL_OFFSET = timedelta(hours=-6)
+CENTRAL_TZ = timezone(CENTRAL_OFFSET)
+
+class RoutineSchedule:
+    """Enabled routines compiled once per config load, indexed by weekday.
+    
+    Weekdays follow routines.yaml: 0=Sunday ... 6=Saturday. Routines with an
+    event_time are also kept sorted by leave time, so the next window after a
+    given minute is a binary search instead of a scan.
+    """
+    
+    def __init__(self, routines):
+        self.quickglance = {day: [] for day in range(7)}
+        self.popups = {day: [] for day in range(7)}
+        self._leave_minutes = {day: [] for day in range(7)}
+        self._timed = {day: [] for day in range(7)}
+        # Calendars a run needs: the quickglance calendar plus any a routine checks
+        self.calendars = {"Me and You"}
+        timed = []
+        for routine in routines or []:
+            if not routine.get("enabled", True):
+                continue
+            days = [day for day in routine.get("trigger_days", []) if day in self.popups]
+            on_quickglance = routine.get("show_on_quickglance", True)
+            for day in days:
+                (self.quickglance if on_quickglance else self.popups)[day].append(routine)
+            # Quickglance routines without a trigger string only use their default time
+            if not on_quickglance or routine.get("trigger_event_contains"):
+                self.calendars.add(routine.get("trigger_calendar", "Me and You"))
+            if on_quickglance and routine.get("event_time"):
+                hour, minute = map(int, routine["event_time"].split(":"))
+                leave = hour * 60 + minute - routine.get("leave_minutes_before", 15)
+                timed.extend((leave, day, routine) for day in days)
+        # Stable sort keeps config order for routines with the same leave time
+        for leave, day, routine in sorted(timed, key=lambda t: t[0]):
+            self._leave_minutes[day].append(leave)
+            self._timed[day].append(routine)
+    
+    @staticmethod
+    def weekday(when):
+        """routines.yaml weekday (0=Sunday) of a datetime"""
+        return (when.weekday() + 1) % 7
+    
+    def next_window(self, when, skip=()):
+        """First timed routine today whose leave time is after when (routines in skip excluded)"""
+        day = self.weekday(when)
+        minutes = self._leave_minutes[day]
+        for i in range(bisect.bisect_right(minutes, when.hour * 60 + when.minute), len(minutes)):
+            routine = self._timed[day][i]
+            if not any(routine is s for s in skip):
+                return routine
+        return None
 
-def load_config():
-    """Load routines configuration"""
+# Compiled schedule for routines.yaml, rebuilt only when the file's mtime changes
+_config_cache = {"mtime": None, "schedule": RoutineSchedule([])}
+
+def load_schedule():
+    """RoutineSchedule for routines.yaml, re-parsed only if the file changed since the last call"""
     config_path = os.path.join(CONFIG_DIR, "config", "routines.yaml")
     try:
-        with open(config_path) as f:
-            return yaml.safe_load(f)
-    except:
-        return {"routines": []}
+        mtime = os.stat(config_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime == _config_cache["mtime"] and mtime is not None:
+        return _config_cache["schedule"]
+    config = {"routines": []}
+    if mtime is not None:
+        try:
+            with open(config_path) as f:
+                config = yaml.safe_load(f) or config
+        except Exception as e:
+            print(f"Config error: {e}")
+    _config_cache.update(mtime=mtime, schedule=RoutineSchedule(config.get("routines")))
+    return _config_cache["schedule"]
 
-def get_calendar_events(calendar_name="Me and You"):
-    """Fetch today's events from Google Calendar, excluding all-day events"""
-    cache = load_cache()
-    cached_today = cache.get("events_today", [])
+def gog_events(calendar_name, *window):
+    """Raw events from gog for a calendar (window: e.g. "--today" or "--days", "7").
     
-    try:
-        result = subprocess.run(
-            ["gog", "calendar", "events", calendar_name, "--today", "--json"],
-            capture_output=True, text=True, timeout=30
-        )
-        # Check if gog returned valid data
-        if not result.stdout or not result.stdout.strip():
-            print("Calendar: Empty response, using cache")
-            return cached_today
-            
-        data = json.loads(result.stdout)
-        events = data.get("events", [])
-        # Filter out all-day events (they start at midnight 00:00:00 in the time portion)
-        filtered = []
-        for event in events:
-            start = event.get("start", {})
-            dateTime = start.get("dateTime", "")
-            # Exclude events that start at midnight (all-day events) - check for T00:00:00 pattern
-            if dateTime and "T00:00:00" not in dateTime:
-                filtered.append(event)
-        
-        # Save to cache
-        cache["events_today"] = filtered
-        save_cache(cache)
-        
-        return filtered
-    except Exception as e:
-        print(f"Calendar error: {e}, using cache")
-        return cached_today
+    Raises on errors and on an empty response, so callers keep what they had.
+    """
+    result = subprocess.run(
+        ["gog", "calendar", "events", calendar_name, *window, "--json"],
+        capture_output=True, text=True, timeout=GOG_TIMEOUT
+    )
+    # Check if gog returned valid data
+    if not result.stdout or not result.stdout.strip():
+        raise ValueError("Empty response")
+    return json.loads(result.stdout).get("events", [])
 
-def get_upcoming_events(calendar_name="Me and You", days=7):
-    """Fetch upcoming events for the next N days, excluding all-day events"""
-    cache = load_cache()
-    cached_upcoming = cache.get("events_upcoming", [])
+def get_upcoming_events(calendar_name="Me and You", days=7, full=False):
+    """Sync the calendar's local store and return its upcoming events.
     
+    Returns cacheable Event dicts sorted by start time, excluding all-day events.
+    full=True forces a full resync instead of a today-only sync.
+    """
+    store = calendar_store(calendar_name)
     try:
-        result = subprocess.run(
-            ["gog", "calendar", "events", calendar_name, "--days", str(days), "--json"],
-            capture_output=True, text=True, timeout=30
-        )
-        # Check if gog returned valid data
-        if not result.stdout or not result.stdout.strip():
-            print("Upcoming: Empty response, using cache")
-            return cached_upcoming
-            
-        data = json.loads(result.stdout)
-        events = data.get("events", [])
+        store.sync(days, full=full)
     except Exception as e:
-        print(f"Upcoming error: {e}")
-        return cached_upcoming
-    
-    # Filter out all-day events (they start at midnight 00:00:00) and sort by time
-    filtered = []
-    for event in events:
-        start = event.get("start", {})
-        dateTime = start.get("dateTime", "")
-        if dateTime and "T00:00:00" not in dateTime:
-            try:
-                event_start = parse_event_time(dateTime)
-                if event_start:
-                    event["_sort_time"] = event_start
-                    filtered.append(event)
-            except:
-                pass
-    
-    # Sort by start time
-    filtered.sort(key=lambda e: e.get("_sort_time", datetime.max))
-    
-    # Save to cache
-    cache = load_cache()
-    cache["events_upcoming"] = filtered
-    save_cache(cache)
-    
-    return filtered
+        print(f"Upcoming error: {e}, using stored events")
+    save_calendar_store(store)
+    with store.lock:
+        return [event.to_dict() for event in store.event_list()]
 
-def check_popup_routines():
+def check_popup_routines(snapshot=None):
     """Check if any popup routines should trigger. Returns (should_popup, message_data)"""
-    config = load_config()
-    routines = config.get("routines", [])
-    
-    now = datetime.now().replace(tzinfo=timezone(CENTRAL_OFFSET))
-    today_dow = now.weekday()
+    if snapshot is None:
+        snapshot = build_snapshot()
+    now = snapshot["now"]
+    now_ts = now.timestamp()
+    # Popup routines enabled for today
+    routines = snapshot["schedule"].popups[RoutineSchedule.weekday(now)]
+    if not routines:
+        return False, None
     
     # Load popup tracking
     cache = load_cache()
     last_popup = cache.get("last_popup", {})
     
     for routine in routines:
-        if not routine.get("enabled", True):
-            continue
-        
-        # Only process popup routines
-        if routine.get("show_on_quickglance", True):
-            continue
-        
-        # Check if today matches allowed days
-        trigger_days = routine.get("trigger_days", [])
-        if today_dow not in trigger_days:
-            continue
-        
         calendar_name = routine.get("trigger_calendar", "Me and You")
         minutes_before = routine.get("minutes_before", 15)
         
-        # Check upcoming events
-        events = get_upcoming_events(calendar_name)
+        # Only events starting within the window
+        events = snapshot_events(snapshot, calendar_name)
         
-        for event in events:
-            summary = event.get("summary", "")
-            start = event.get("start", {}).get("dateTime", "")
-            if not start:
-                continue
-            
-            event_start = parse_event_time(start)
-            if not event_start or event_start <= now:
+        for event in events.between(now_ts, now_ts + minutes_before * 60):
+            summary = event.summary
+            if event.start <= now_ts:
                 continue
-            
-            # Check if within the window
-            diff = event_start - now
-            mins_until = diff.total_seconds() / 60
+            event_start = event.local(event.start)
+            mins_until = (event.start - now_ts) / 60
             
             if mins_until <= minutes_before and mins_until > 0:
                 # Check if we already showed this popup recently (within 20 min)
@@ -205,291 +282,596 @@ def check_popup_routines():
                     countdown = f"{mins}m"
                 
                 # Update cache to prevent repeat
-                cache["last_popup"] = {"event_id": event_id, "time": now.isoformat()}
-                save_cache(cache)
+                update_cache(last_popup={"event_id": event_id, "time": now.isoformat()})
                 
                 return True, {
                     "event": summary,
                     "countdown": countdown,
-                    "time": event_start.strftime("%-I:%M %p")
+                    "time": event_start.strftime("%-I:%M %p"),
+                    "starts_in": int(event.start - now_ts),
+                    "duration": routine.get("popup_duration", POPUP_SECONDS),
                 }
     
     return False, None
 
-def get_routine_countdown():
-    """Check configured routines and return quickglance countdown data"""
-    config = load_config()
-    routines = config.get("routines", [])
+def format_countdown(diff):
+    """"1h 5m" / "5m" for a timedelta"""
+    hours = diff.seconds // 3600
+    mins = (diff.seconds % 3600) // 60
+    return f"{hours}h {mins}m" if hours > 0 else f"{mins}m"
+
+def routine_countdown(routine, leave_time, now):
+    """(countdown, label, name) for leaving at leave_time"""
+    name = routine.get("name", "Event")
+    countdown = format_countdown(leave_time - now)
+    # Bedtime-style routines (leave_minutes_before = 0) are labelled with their name
+    if routine.get("leave_minutes_before", 15) == 0:
+        return countdown, name, name
+    return countdown, f"Leave ({leave_time.strftime('%-I:%M')})", name
+
+def get_routine_countdown(snapshot=None):
+    """Check configured routines and return quickglance countdown data.
     
-    now = datetime.now().replace(tzinfo=timezone(CENTRAL_OFFSET))
-    today_dow = now.weekday()  # 0=Monday, 6=Sunday
+    Routines that match a calendar event win (in config order); otherwise the
+    next routine window today, found by bisect in the compiled schedule.
+    """
+    if snapshot is None:
+        snapshot = build_snapshot()
+    schedule = snapshot["schedule"]
+    now = snapshot["now"]
+    now_ts = now.timestamp()
     
-    for routine in routines:
-        if not routine.get("enabled", True):
-            continue
-        
-        # Skip popup routines - they're handled separately
-        if not routine.get("show_on_quickglance", True):
-            continue
-        
-        # Check if today matches allowed days
-        trigger_days = routine.get("trigger_days", [])
-        if today_dow not in trigger_days:
-            continue
-        
-        # Check calendar for matching event
-        calendar_name = routine.get("trigger_calendar", "Me and You")
+    # Routines whose default time can't be used because they need an event that isn't there
+    skip = []
+    for routine in schedule.quickglance[RoutineSchedule.weekday(now)]:
         event_match = routine.get("trigger_event_contains", "")
-        
-        # Only check calendar events if there's a specific event_match
-        # Otherwise, use default_time only (for fixed routines like School/Bedtime)
         found_event = False
-        
-        if event_match:  # Only search calendar if trigger_event_contains is set
-            events = get_calendar_events(calendar_name)
-            
-            for event in events:
-                summary = event.get("summary", "")
-                
-                # Only match events containing the trigger string
-                if event_match.lower() not in summary.lower():
-                    continue
-                    
-                found_event = True
-                start = event.get("start", {}).get("dateTime", "")
-                if start:
-                    event_start = parse_event_time(start)
-                    if event_start and event_start > now:
-                        leave_time = event_start - timedelta(minutes=routine.get("leave_minutes_before", 15))
-                        if leave_time > now:
-                            diff = leave_time - now
-                            hours = diff.seconds // 3600
-                            mins = (diff.seconds % 3600) // 60
-                            if hours > 0:
-                                countdown = f"{hours}h {mins}m"
-                            else:
-                                countdown = f"{mins}m"
-                            
-                            # Check if this is bedtime (leave_minutes_before = 0)
-                            if routine.get("leave_minutes_before", 15) == 0:
-                                return countdown, routine.get("name", "Event"), routine.get("name", "Event")
-                            else:
-                                # Format leave time
-                                leave_str = leave_time.strftime("%-I:%M")
-                                return countdown, f"Leave ({leave_str})", routine.get("name", "Event")
-                            countdown = f"{hours}h {mins}m"
-                        else:
-                            countdown = f"{mins}m"
-                        
-                        # Check if this is bedtime (leave_minutes_before = 0)
-                        if routine.get("leave_minutes_before", 15) == 0:
-                            return countdown, routine.get("name", "Event"), routine.get("name", "Event")
-                        else:
-                            # Format leave time
-                            leave_str = leave_time.strftime("%-I:%M")
-                            return countdown, f"Leave ({leave_str})", routine.get("name", "Event")
-        
-        # Check if we have a default time for this routine
-        default_time = routine.get("event_time", "")
-        require_event = routine.get("require_event", False)
-        
+        # Only search the calendar if trigger_event_contains is set
+        # Otherwise, use default_time only (for fixed routines like School/Bedtime)
+        events = (snapshot_events(snapshot, routine.get("trigger_calendar", "Me and You"), today_only=True)
+                  if event_match else [])
+        for event in events:
+            # Only match events containing the trigger string
+            if event_match.lower() not in event.summary.lower():
+                continue
+            found_event = True
+            leave = event.start - routine.get("leave_minutes_before", 15) * 60
+            if event.start > now_ts and leave > now_ts:
+                return routine_countdown(routine, event.local(leave), now)
         # If require_event is true, only show countdown if a calendar event matched above
-        # Skip the default time fallback if require_event is true
-        if require_event and not found_event:
-            continue
-        
-        if default_time:
-            # Parse default time
-            hour, minute = map(int, default_time.split(":"))
-            event_time = now.replace(hour=hour, minute=minute, second=0)
-            leave_time = event_time - timedelta(minutes=routine.get("leave_minutes_before", 15))
-            if leave_time > now:
-                diff = leave_time - now
-                hours = diff.seconds // 3600
-                mins = (diff.seconds % 3600) // 60
-                # Only show countdown if within 2 hours (otherwise it's not useful)
-                if hours >= 2:
-                    return "", "", ""
-                if hours > 0:
-                    countdown = f"{hours}h {mins}m"
-                else:
-                    countdown = f"{mins}m"
-                
-                # Check if this is bedtime (leave_minutes_before = 0)
-                if routine.get("leave_minutes_before", 15) == 0:
-                    return countdown, routine.get("name", "Event"), routine.get("name", "Event")
-                else:
-                    leave_str = leave_time.strftime("%-I:%M")
-                    return countdown, f"Leave ({leave_str})", routine.get("name", "Event")
+        if routine.get("require_event", False) and not found_event:
+            skip.append(routine)
     
-    return "", "", ""
-
-def parse_event_time(start_str):
-    """Fetch today's events from Google Calendar"""
-    try:
-        result = subprocess.run(
-            ["gog", "calendar", "events", "Me and You", "--today", "--json"],
-            capture_output=True, text=True, timeout=30
-        )
-        data = json.loads(result.stdout)
-        return data.get("events", [])
-    except Exception as e:
-        print(f"Calendar error: {e}")
-        return []
+    routine = schedule.next_window(now, skip)
+    if routine is None:
+        return "", "", ""
+    hour, minute = map(int, routine["event_time"].split(":"))
+    event_time = now.replace(hour=hour, minute=minute, second=0)
+    leave_time = event_time - timedelta(minutes=routine.get("leave_minutes_before", 15))
+    # Only show countdown if within 2 hours (otherwise it's not useful)
+    if (leave_time - now).seconds // 3600 >= 2:
+        return "", "", ""
+    return routine_countdown(routine, leave_time, now)
 
 def get_todoist_dinner():
-    """Fetch today's dinner from Todoist"""
+    """Fetch today's dinner from Todoist (errors propagate so fetch_sources can fall back)"""
     token = os.environ.get("TODOIST_API_TOKEN") or os.environ.get("TODOIST_TOKEN")
     if not token:
         print("Todoist error: No API token")
         return "TBD"
-    try:
-        result = subprocess.run(
-            ["curl", "-s", "https://api.todoist.com/api/v2/projects", 
-             "-H", f"Authorization: Bearer {token}"],
-            capture_output=True, text=True, timeout=15
-        )
-        projects = json.loads(result.stdout)
-        dinner_id = None
-        for p in projects:
-            if p.get("name") == "Dinner":
-                dinner_id = p.get("id")
-                break
-        
-        if not dinner_id:
-            return "TBD"
-            
-        today = datetime.now().strftime("%Y-%m-%d")
-        result = subprocess.run(
-            ["curl", "-s", f"https://api.todoist.com/api/v2/tasks?project_id={dinner_id}",
-             "-H", f"Authorization: Bearer {token}"],
-            capture_output=True, text=True, timeout=15
-        )
-        tasks = json.loads(result.stdout)
-        for task in tasks:
-            due = task.get("due", {})
-            if due.get("date") == today:
-                return task.get("content", "TBD")
-        return "TBD"
-    except Exception as e:
-        print(f"Todoist error: {e}")
+    headers = {"Authorization": f"Bearer {token}"}
+    projects = http_client.get_json(f"{TODOIST_API}/projects", headers=headers, timeout=15)
+    dinner_id = None
+    for p in projects:
+        if p.get("name") == "Dinner":
+            dinner_id = p.get("id")
+            break
+    
+    if not dinner_id:
         return "TBD"
+        
+    today = datetime.now().strftime("%Y-%m-%d")
+    tasks = http_client.get_json(f"{TODOIST_API}/tasks", headers=headers,
+                                 params={"project_id": dinner_id}, timeout=15)
+    for task in tasks:
+        due = task.get("due", {})
+        if due.get("date") == today:
+            return task.get("content", "TBD")
+    return "TBD"
 
 def get_weather():
-    """Get weather from wttr.in for Fultondale, AL"""
-    try:
-        import urllib.request
-        url = "https://wttr.in/Fultondale+AL?format=j1"
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-        
-        current = data.get("current_condition", [{}])[0]
-        temp_f = current.get("temp_F", "N/A")
-        feels_like = current.get("FeelsLikeF", temp_f)
-        humidity = current.get("humidity", "N/A")
-        wind = current.get("windspeedMiles", "N/A")
-        desc = current.get("weatherDesc", [{}])[0].get("value", "Unknown")
-        
-        # Map weather description to icon
-        icon_map = {
-            "Sunny": "☀️",
-            "Clear": "🌙",
-            "Partly cloudy": "⛅",
-            "Cloudy": "☁️",
-            "Overcast": "☁️",
-            "Mist": "🌫️",
-            "Fog": "🌫️",
-            "Rain": "🌧️",
-            "Light rain": "🌦️",
-            "Heavy rain": "🌧️",
-            "Thunderstorm": "⛈️",
-            "Snow": "❄️",
-            "Light snow": "🌨️",
-        }
-        icon = "☀️"
-        for key, val in icon_map.items():
-            if key.lower() in desc.lower():
-                icon = val
-                break
-        
-        # Get today's high/low from weather array
-        high = temp_f
-        low = temp_f
-        weather_arr = data.get("weather", [])
-        if weather_arr:
-            today = weather_arr[0]
-            high = today.get("maxtempF", temp_f)
-            low = today.get("mintempF", temp_f)
-        
-        return {
-            "icon": icon,
-            "temp": f"{temp_f}°",
-            "high": high,
-            "low": low,
-            "desc": desc
-        }
-    except Exception as e:
-        print(f"Weather error: {e}")
-        return {"icon": "☀️", "temp": "58°", "high": "62", "low": "40", "desc": "Sunny"}
+    """Get weather from wttr.in for Fultondale, AL (errors propagate so fetch_sources can fall back)"""
+    data = http_client.get_json(WEATHER_URL, params={"format": "j1"}, timeout=10)
+    
+    current = data.get("current_condition", [{}])[0]
+    temp_f = current.get("temp_F", "N/A")
+    feels_like = current.get("FeelsLikeF", temp_f)
+    humidity = current.get("humidity", "N/A")
+    wind = current.get("windspeedMiles", "N/A")
+    desc = current.get("weatherDesc", [{}])[0].get("value", "Unknown")
+    
+    # Map weather description to icon
+    icon_map = {
+        "Sunny": "☀️",
+        "Clear": "🌙",
+        "Partly cloudy": "⛅",
+        "Cloudy": "☁️",
+        "Overcast": "☁️",
+        "Mist": "🌫️",
+        "Fog": "🌫️",
+        "Rain": "🌧️",
+        "Light rain": "🌦️",
+        "Heavy rain": "🌧️",
+        "Thunderstorm": "⛈️",
+        "Snow": "❄️",
+        "Light snow": "🌨️",
+    }
+    icon = "☀️"
+    for key, val in icon_map.items():
+        if key.lower() in desc.lower():
+            icon = val
+            break
+    
+    # Get today's high/low from weather array
+    high = temp_f
+    low = temp_f
+    weather_arr = data.get("weather", [])
+    if weather_arr:
+        today = weather_arr[0]
+        high = today.get("maxtempF", temp_f)
+        low = today.get("mintempF", temp_f)
+    
+    return {
+        "icon": icon,
+        "temp": f"{temp_f}°",
+        "high": high,
+        "low": low,
+        "desc": desc
+    }
 
 def get_family_tasks():
-    """Fetch family tasks from Todoist"""
+    """Fetch family tasks from Todoist (errors propagate so fetch_sources can fall back)"""
     token = os.environ.get("TODOIST_API_TOKEN") or os.environ.get("TODOIST_TOKEN")
     if not token:
         print("Family tasks error: No TODOIST_API_TOKEN")
         return ["Set up Todoist", "Check API key"]
+    tasks = http_client.get_json(f"{TODOIST_API}/tasks", headers={"Authorization": f"Bearer {token}"},
+                                 params={"project_id": "2366876876"}, timeout=15)
+    task_list = []
+    for t in tasks[:3]:
+        content = t.get("content", "")
+        due = t.get("due", {})
+        due_date = due.get("date") if due else None
+        due_str = None
+        if due_date:
+            # Format date nicely
+            try:
+                from datetime import datetime
+                dt = datetime.strptime(due_date, "%Y-%m-%d")
+                due_str = dt.strftime("%b %d")
+            except:
+                due_str = due_date
+        task_list.append({"name": content, "due": due_str})
+    return task_list
+
+def parse_event_time(time_str):
+    """(epoch seconds, UTC offset in minutes) for a gog dateTime.
+    
+    Times without an offset are Central; UTC ("Z") times are shown in Central.
+    Raises ValueError for anything unparseable.
+    """
+    dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=CENTRAL_TZ)
+    elif not dt.utcoffset():
+        dt = dt.astimezone(CENTRAL_TZ)
+    return dt.timestamp(), int(dt.utcoffset().total_seconds() // 60)
+
+class Event:
+    """A timed calendar event, parsed once when it is fetched.
+    
+    start/end are epoch seconds so comparisons are plain float compares;
+    offset is the UTC offset (minutes) the calendar gave, used for display.
+    """
+    __slots__ = ("id", "summary", "location", "start", "end", "offset")
+    
+    def __init__(self, id, summary, location, start, end=None, offset=0):
+        self.id = id
+        self.summary = summary
+        self.location = location
+        self.start = start
+        self.end = end
+        self.offset = offset
+    
+    @classmethod
+    def from_gog(cls, raw):
+        """Event from a gog JSON event, or None for all-day and unparseable events"""
+        start_str = raw.get("start", {}).get("dateTime", "")
+        # All-day events start at midnight 00:00:00
+        if not start_str or "T00:00:00" in start_str:
+            return None
+        end_str = raw.get("end", {}).get("dateTime", "")
+        try:
+            start, offset = parse_event_time(start_str)
+            end = parse_event_time(end_str)[0] if end_str else None
+        except ValueError:
+            return None
+        return cls(raw.get("id"), raw.get("summary", ""), raw.get("location", ""), start, end, offset)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Event from its cached form (raw gog events from older caches are parsed)"""
+        if isinstance(data.get("start"), dict):
+            return cls.from_gog(data)
+        return cls(data.get("id"), data.get("summary", ""), data.get("location", ""),
+                   data["start"], data.get("end"), data.get("offset", 0))
+    
+    def to_dict(self):
+        return {"id": self.id, "summary": self.summary, "location": self.location,
+                "start": self.start, "end": self.end, "offset": self.offset}
+    
+    def local(self, epoch):
+        """datetime for epoch in this event's UTC offset"""
+        return datetime.fromtimestamp(epoch, timezone(timedelta(minutes=self.offset)))
+
+class EventList:
+    """Events sorted by start time; current/next/range lookups are bisects on the start times"""
+    __slots__ = ("events", "starts")
+    
+    def __init__(self, events=()):
+        self.events = sorted(events, key=lambda e: e.start)
+        self.starts = [e.start for e in self.events]
+    
+    @classmethod
+    def from_dicts(cls, items):
+        """EventList from cached event dicts, dropping any that can't be read"""
+        events = []
+        for item in items or []:
+            try:
+                event = Event.from_dict(item)
+            except (AttributeError, KeyError, TypeError):
+                event = None
+            if event:
+                events.append(event)
+        return cls(events)
+    
+    def __iter__(self):
+        return iter(self.events)
+    
+    def __len__(self):
+        return len(self.events)
+    
+    def between(self, start, end):
+        """Events starting in [start, end)"""
+        return self.events[bisect.bisect_left(self.starts, start):bisect.bisect_left(self.starts, end)]
+    
+    def next_after(self, when):
+        """First event starting after when, or None"""
+        i = bisect.bisect_right(self.starts, when)
+        return self.events[i] if i < len(self.events) else None
+    
+    def current_at(self, when, since=None):
+        """Latest-starting event that started by when (and not before since) and hasn't ended"""
+        lo = 0 if since is None else bisect.bisect_left(self.starts, since)
+        for i in range(bisect.bisect_right(self.starts, when) - 1, lo - 1, -1):
+            event = self.events[i]
+            if event.end is None or event.end > when:
+                return event
+        return None
+
+def day_bounds(now):
+    """Epoch seconds of the start of now's day and of the next day"""
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp(), (midnight + timedelta(days=1)).timestamp()
+
+class CalendarStore:
+    """Local copy of one calendar's upcoming events, kept in step with small syncs.
+    
+    gog has no sync token or changed-since query, so a full --days resync
+    runs only every CALENDAR_RESYNC seconds; runs in between pull just
+    --today and diff it against the store by event id. Unchanged events
+    aren't re-parsed, and today's events missing from the response are
+    treated as cancelled. Events that ended before today are expired on
+    every sync. lock guards the store's contents, never a gog call.
+    """
+    
+    def __init__(self, name, data=None):
+        data = data or {}
+        self.name = name
+        self.events = {}
+        for key, item in data.get("events", {}).items():
+            event = Event.from_dict(item)
+            if event:
+                self.events[key] = event
+        # Per-event version (gog's updated/etag, else a hash of the raw event)
+        self.versions = data.get("versions", {})
+        self.full_sync_at = data.get("full_sync_at", 0)
+        # When the sync last applied here started (a slower, older sync mustn't overwrite it)
+        self.applied_at = 0
+        self.lock = threading.Lock()
+    
+    def to_dict(self):
+        return {"events": {key: event.to_dict() for key, event in self.events.items()},
+                "versions": self.versions, "full_sync_at": self.full_sync_at}
+    
+    @staticmethod
+    def key(raw):
+        """Store key for a raw gog event (events without an id are keyed by summary and start)"""
+        return raw.get("id") or f"{raw.get('summary', '')}|{raw.get('start', {}).get('dateTime', '')}"
+    
+    @staticmethod
+    def version(raw):
+        return (raw.get("etag") or raw.get("updated")
+                or hashlib.sha1(json.dumps(raw, sort_keys=True).encode()).hexdigest()[:16])
+    
+    def apply(self, raw_events, window=None):
+        """Merge raw gog events into the store; returns (inserted, updated, cancelled).
+        
+        Without a window the response replaces the store (full resync).
+        With a (start, end) window, stored events starting in it that the
+        response doesn't mention are cancelled.
+        """
+        seen = set()
+        inserted = updated = cancelled = 0
+        for raw in raw_events:
+            key = self.key(raw)
+            if raw.get("status") == "cancelled":
+                if self.events.pop(key, None):
+                    self.versions.pop(key, None)
+                    cancelled += 1
+                continue
+            seen.add(key)
+            version = self.version(raw)
+            if key in self.events and self.versions.get(key) == version:
+                continue
+            event = Event.from_gog(raw)
+            if event is None:
+                # Now all-day (or unreadable): drop any earlier timed version
+                seen.discard(key)
+                continue
+            if key in self.events:
+                updated += 1
+            else:
+                inserted += 1
+            self.events[key] = event
+            self.versions[key] = version
+        for key, event in list(self.events.items()):
+            if key in seen:
+                continue
+            if window is None or window[0] <= event.start < window[1]:
+                del self.events[key]
+                self.versions.pop(key, None)
+                cancelled += 1
+        return inserted, updated, cancelled
+    
+    def expire(self, before):
+        """Drop events that ended (or, without an end, started) before the given epoch"""
+        for key, event in list(self.events.items()):
+            if (event.end if event.end is not None else event.start) < before:
+                del self.events[key]
+                self.versions.pop(key, None)
+    
+    def sync(self, days=7, full=False):
+        """Bring the store up to date: a full resync when due, otherwise today's events only"""
+        now = datetime.now().replace(tzinfo=CENTRAL_TZ)
+        today = day_bounds(now)
+        clock = now.timestamp()
+        with self.lock:
+            self.expire(today[0])
+            full = full or clock - self.full_sync_at >= CALENDAR_RESYNC
+        # gog runs outside the lock, so a hung call abandoned at the deadline can't hold up later syncs
+        raw_events = gog_events(self.name, "--days", str(days)) if full else gog_events(self.name, "--today")
+        with self.lock:
+            if clock < self.applied_at:
+                return
+            changes = self.apply(raw_events, window=None if full else today)
+            self.applied_at = clock
+            if full:
+                self.full_sync_at = clock
+        kind = "full" if full else "today"
+        if any(changes):
+            print(f"Upcoming {self.name}: {kind} sync +{changes[0]} ~{changes[1]} -{changes[2]}")
+    
+    def event_list(self):
+        return EventList(self.events.values())
+
+# In-memory stores for this process, loaded from the cache file on first use
+_calendar_stores = {}
+
+def calendar_store(calendar_name):
+    """The CalendarStore for a calendar, read from the cache the first time"""
+    with _cache_lock:
+        store = _calendar_stores.get(calendar_name)
+        if store is None:
+            data = load_cache().get("calendar_stores", {}).get(calendar_name)
+            store = _calendar_stores[calendar_name] = CalendarStore(calendar_name, data)
+        return store
+
+def save_calendar_store(store):
+    """Persist one calendar's store without touching the others"""
+    with store.lock:
+        data = store.to_dict()
+    with _cache_lock:
+        cache = load_cache()
+        stores = cache.get("calendar_stores", {})
+        stores[store.name] = data
+        cache["calendar_stores"] = stores
+        # Superseded by the stores
+        cache.pop("events_upcoming", None)
+        save_cache(cache)
+
+# Values used when a source misses the deadline and has never succeeded before
+# Calendar sources are named "calendar:<calendar name>" and share the "calendar" entries
+SOURCE_DEFAULTS = {
+    "calendar": [],
+    "dinner": "TBD",
+    "weather": {"icon": "☀️", "temp": "58°", "high": "62", "low": "40", "desc": "Sunny"},
+    "tasks": [],
+}
+
+# How long each source's value is fresh (seconds). 0 = always refetch.
+SOURCE_TTL = {
+    "calendar": 120,
+    "dinner": 3600,
+    "weather": 900,
+    "tasks": 600,
+}
+
+# Cached values older than this are evicted rather than served stale
+SOURCE_MAX_STALE = 24 * 3600
+
+# Background revalidation threads started by fetch_sources
+_refreshes = []
+
+def _source_setting(settings, name, default=None):
+    """Look up a per-source setting, keyed by the part of the name before any ':'"""
+    return settings.get(name.split(":", 1)[0], default)
+
+def _run_source(name, fetch, results):
+    """Run a single source fetcher and report its result on the queue"""
     try:
-        result = subprocess.run(
-            ["curl", "-s", "https://api.todoist.com/api/v2/tasks?project_id=2366876876",
-             "-H", f"Authorization: Bearer {token}"],
-            capture_output=True, text=True, timeout=15
-        )
-        tasks = json.loads(result.stdout)
-        task_list = []
-        for t in tasks[:3]:
-            content = t.get("content", "")
-            due = t.get("due", {})
-            due_date = due.get("date") if due else None
-            due_str = None
-            if due_date:
-                # Format date nicely
-                try:
-                    from datetime import datetime
-                    dt = datetime.strptime(due_date, "%Y-%m-%d")
-                    due_str = dt.strftime("%b %d")
-                except:
-                    due_str = due_date
-            task_list.append({"name": content, "due": due_str})
-        return task_list
+        results.put((name, fetch(), None))
     except Exception as e:
-        print(f"Family tasks error: {e}")
-        return [{"name": "Set up Todoist", "due": None}, {"name": "Check API key", "due": None}]
+        results.put((name, None, e))
 
-def parse_event_time(start_str):
-    """Parse event time string to datetime"""
-    if not start_str:
-        return None
+def _store_source(name, value):
+    """Record a successful fetch in the per-source cache"""
+    with _cache_lock:
+        cache = load_cache()
+        entries = cache.get("sources", {})
+        entries[name] = {"value": value, "fetched_at": time.time()}
+        cache["sources"] = entries
+        save_cache(cache)
+
+def _refresh_source(name, fetch):
+    """Background revalidation of a stale source"""
     try:
-        if start_str.endswith("Z"):
-            dt = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-            # Convert to Central
-            return dt + CENTRAL_OFFSET
-        else:
-            dt = datetime.fromisoformat(start_str)
-            if dt.tzinfo is None:
-                return dt + CENTRAL_OFFSET
-            return dt
-    except:
-        return None
+        _store_source(name, fetch())
+    except Exception as e:
+        print(f"{name} refresh error: {e}")
+
+def _cached_sources():
+    """Load per-source cache entries, evicting anything older than SOURCE_MAX_STALE"""
+    now = time.time()
+    with _cache_lock:
+        cache = load_cache()
+        entries = cache.get("sources", {})
+        live = {name: entry for name, entry in entries.items()
+                if now - entry.get("fetched_at", 0) < SOURCE_MAX_STALE}
+        if len(live) != len(entries):
+            cache["sources"] = live
+            save_cache(cache)
+    return live
+
+def wait_for_refreshes(timeout=FETCH_DEADLINE):
+    """Give background revalidations a chance to land in the cache before exit"""
+    end = time.monotonic() + timeout
+    for t in _refreshes:
+        t.join(max(0, end - time.monotonic()))
+    _refreshes.clear()
+
+def fetch_sources(sources, deadline=FETCH_DEADLINE, use_cache=True):
+    """Fetch all sources in parallel within one overall deadline.
+    
+    sources maps a source name to a zero-argument fetcher. Values younger than
+    their SOURCE_TTL are served from cache without a fetch; stale values are
+    served immediately while a background refresh runs. Sources that fail or
+    are still running at the deadline fall back to their last good value.
+    A deadline of 0 only reads the cache. Returns a dict of source name -> value.
+    """
+    cached = _cached_sources()
+    now = time.time()
+    values = {}
+    to_fetch = {}
+    for name, fetch in sources.items():
+        entry = cached.get(name)
+        if entry is None or not use_cache or not _source_setting(SOURCE_TTL, name, 0):
+            to_fetch[name] = fetch
+            continue
+        values[name] = entry["value"]
+        if deadline > 0 and now - entry["fetched_at"] >= _source_setting(SOURCE_TTL, name, 0):
+            # Stale: serve it now, revalidate in the background
+            t = threading.Thread(target=_refresh_source, args=(name, fetch),
+                                 name=f"refresh-{name}", daemon=True)
+            t.start()
+            _refreshes.append(t)
+    
+    results = queue.Queue()
+    # Daemon threads so a hung gog/HTTP call can't keep the process alive past the deadline
+    # (deadline 0 means cache only - don't start fetches nobody will wait for)
+    for name, fetch in (to_fetch.items() if deadline > 0 else ()):
+        threading.Thread(target=_run_source, args=(name, fetch, results),
+                         name=f"fetch-{name}", daemon=True).start()
+    
+    pending = set(to_fetch)
+    end = time.monotonic() + deadline
+    while pending:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            name, value, error = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        pending.discard(name)
+        if error is not None:
+            print(f"{name} error: {error}")
+            continue
+        values[name] = value
+        _store_source(name, value)
+    
+    for name in to_fetch:
+        if name not in values:
+            if name in pending and deadline > 0:
+                print(f"{name}: missed {deadline:.0f}s deadline, using last good value")
+            entry = cached.get(name)
+            values[name] = entry["value"] if entry else _source_setting(SOURCE_DEFAULTS, name)
+    return values
+
+def build_snapshot(use_cache=True, deadline=FETCH_DEADLINE):
+    """Fetch everything one run needs exactly once.
+    
+    Each calendar is synced into its local store a single time (see
+    CalendarStore); today's events are derived from it. Quickglance,
+    countdown and popup checks all read from the returned snapshot instead
+    of calling gog themselves.
+    deadline=0 returns immediately with whatever the cache has.
+    """
+    schedule = load_schedule()
+    sources = {"dinner": get_todoist_dinner, "weather": get_weather, "tasks": get_family_tasks}
+    for calendar_name in schedule.calendars:
+        # A forced refresh (use_cache=False) also forces a full calendar resync
+        sources[f"calendar:{calendar_name}"] = (lambda name=calendar_name:
+                                                get_upcoming_events(name, full=not use_cache))
+    values = fetch_sources(sources, deadline=deadline, use_cache=use_cache)
+    
+    return {
+        "now": datetime.now().replace(tzinfo=timezone(CENTRAL_OFFSET)),
+        "schedule": schedule,
+        "calendars": {name.split(":", 1)[1]: EventList.from_dicts(events) for name, events in values.items()
+                      if name.startswith("calendar:")},
+        "dinner": values["dinner"],
+        "weather": values["weather"],
+        "tasks": values["tasks"],
+    }
+
+def snapshot_events(snapshot, calendar_name, today_only=False):
+    """EventList for a calendar from the snapshot; today_only gives a list of today's events"""
+    events = snapshot["calendars"].get(calendar_name) or EventList()
+    if not today_only:
+        return events
+    return events.between(*day_bounds(snapshot["now"]))
 
-def build_quickglance():
+def build_quickglance(snapshot=None):
     """Build the quick glance data"""
-    now = datetime.now().replace(tzinfo=timezone(CENTRAL_OFFSET))
+    if snapshot is None:
+        snapshot = build_snapshot()
+    now = snapshot["now"]
     
-    # Today's events for current event (from Me and You)
-    events = get_calendar_events()
-    # Upcoming events (next 7 days) for next event (Me and You only)
-    upcoming_events = get_upcoming_events("Me and You")
+    now_ts = now.timestamp()
+    
+    # Me and You: current event from today's events, next event from the next 7 days
+    events = snapshot_events(snapshot, "Me and You")
     
     current_event = None
     current_event_time = None
@@ -498,41 +880,31 @@ def build_quickglance():
     next_event_time = None
     next_location = None
     
-    # Find current event (from today's events)
-    for event in events:
-        start = event.get("start", {}).get("dateTime", "")
-        end = event.get("end", {}).get("dateTime", "")
-        event_start = parse_event_time(start)
-        event_end = parse_event_time(end) if end else None
-        
-        if event_start and event_start <= now:
-            # Check if event hasn't ended yet
-            if not event_end or event_end > now:
-                current_event = event.get("summary", "Event")
-                # Show END time of current event
-                current_event_time = event_end.strftime("%-I:%M %p") if event_end else ""
-                current_location = event.get("location", "")
-    
-    # Find next event (from upcoming events)
-    for event in upcoming_events:
-        start = event.get("start", {}).get("dateTime", "")
-        event_start = parse_event_time(start)
-        
-        if event_start and event_start > now:
-            next_event = event.get("summary", "Event")
-            next_event_time = event_start.strftime("%-I:%M %p")
-            next_location = event.get("location", "")
-            # Check if it's tomorrow or later for date display
-            if event_start.date() > now.date():
-                next_event_time = event_start.strftime("%a %-I:%M %p")
-            break
+    # Find current event (started today and hasn't ended yet)
+    event = events.current_at(now_ts, since=day_bounds(now)[0])
+    if event:
+        current_event = event.summary or "Event"
+        # Show END time of current event
+        current_event_time = event.local(event.end).strftime("%-I:%M %p") if event.end else ""
+        current_location = event.location
     
-    dinner = get_todoist_dinner()
-    weather = get_weather()
-    family_tasks = get_family_tasks()
+    # Find next event
+    event = events.next_after(now_ts)
+    if event:
+        event_start = event.local(event.start)
+        next_event = event.summary or "Event"
+        next_event_time = event_start.strftime("%-I:%M %p")
+        next_location = event.location
+        # Check if it's tomorrow or later for date display
+        if event_start.date() > now.date():
+            next_event_time = event_start.strftime("%a %-I:%M %p")
+    
+    dinner = snapshot["dinner"]
+    weather = snapshot["weather"]
+    family_tasks = snapshot["tasks"]
     
     # Get routine countdown
-    countdown, countdown_label, countdown_routine = get_routine_countdown()
+    countdown, countdown_label, countdown_routine = get_routine_countdown(snapshot)
     
     # Only show countdown for Church/School/Bedtime - skip fallback for other events
     # If routine returned nothing, don't show countdown for regular events
@@ -570,6 +942,51 @@ def build_quickglance():
     
     return data
 
+# Fields that tick every minute and shouldn't count as a content change
+VOLATILE_FIELDS = ("time", "date")
+
+def content_key(data):
+    """Stable fingerprint of quickglance content, ignoring the clock fields"""
+    return json.dumps({k: v for k, v in data.items() if k not in VOLATILE_FIELDS},
+                      sort_keys=True, default=str)
+
+def _post_display(url, path, payload, results):
+    """POST to one display, reporting (url, response, error) on results"""
+    try:
+        results.put((url, http_client.post(f"{url}{path}", json=payload, timeout=DISPLAY_TIMEOUT), None))
+    except Exception as e:
+        results.put((url, None, e))
+
+def post_displays(path, payload, timeout=DISPLAY_TIMEOUT):
+    """POST the same payload to every display concurrently.
+    
+    Returns {url: (response, error)}; a display that hasn't answered within
+    timeout gets an error instead of holding up the others.
+    """
+    results = queue.Queue()
+    # Daemon threads, like fetch_sources: a hung tablet can't keep the process alive
+    for url in DISPLAY_URLS:
+        threading.Thread(target=_post_display, args=(url, path, payload, results),
+                         name=f"push-{url}", daemon=True).start()
+    outcomes = {}
+    end = time.monotonic() + timeout
+    while len(outcomes) < len(DISPLAY_URLS):
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            url, response, error = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        outcomes[url] = (response, error)
+    for url in DISPLAY_URLS:
+        outcomes.setdefault(url, (None, f"no response within {timeout:g}s"))
+    return outcomes
+
+def _display_label(url):
+    """Prefix for push messages when there's more than one display"""
+    return f"[{url}] " if len(DISPLAY_URLS) > 1 else ""
+
 def push_template(force=False):
     """Push template to display automatically"""
     if not force:
@@ -580,50 +997,142 @@ def push_template(force=False):
     try:
         with open(template_path, "r") as f:
             content = f.read()
-        r = requests.post(f"{DISPLAY_URL}/api/template/quickglance.html", 
-                         json={"content": content}, timeout=10)
-        if r.status_code == 200:
-            print(f"Template pushed: {r.json()}")
-        else:
-            print(f"Template push failed: {r.status_code}")
     except Exception as e:
         print(f"Template push error: {e}")
+        return
+    for url, (r, error) in post_displays("/api/template/quickglance.html", {"content": content}).items():
+        if error is not None:
+            print(f"{_display_label(url)}Template push error: {error}")
+        elif r.status_code == 200:
+            print(f"{_display_label(url)}Template pushed: {r.json()}")
+        else:
+            print(f"{_display_label(url)}Template push failed: {r.status_code}")
+
+def quickglance_payload(data, force=False):
+    """/api/update payload for quickglance data.
+    
+    The receiver compares content_hash against the last push and, with
+    merge=keep_events, keeps its current events if the new data has none
+    (calendar API flakiness shouldn't clear the display). force skips both.
+    """
+    payload = {"mode": "quickglance", "title": "Quick Look", "content": data}
+    if not force:
+        payload["content_hash"] = hashlib.sha1(content_key(data).encode()).hexdigest()
+        payload["merge"] = "keep_events"
+    return payload
+
+# Seconds a countdown popup stays up when its routine doesn't set popup_duration
+POPUP_SECONDS = 60
+
+def popup_payload(popup_data):
+    """/api/message payload for a countdown popup.
+    
+    It goes through the receiver's message queue at countdown priority, and is
+    dropped if it is still waiting when the event starts.
+    """
+    return {
+        "type": "countdown",
+        "title": "Upcoming Event",
+        "auto_dismiss": popup_data.get("duration", POPUP_SECONDS),
+        "expires": max(1, popup_data["starts_in"]),
+        "content": {
+            "event": popup_data["event"],
+            "days": 0,
+            "hours": 0,
+            "minutes": int(popup_data["countdown"].replace("m", "").replace("h", " ").split()[0]) if "m" in popup_data["countdown"] else 0,
+            "message": f"Starts at {popup_data['time']}"
+        }
+    }
+
+def source_ages():
+    """Seconds since each cached source was last fetched"""
+    now = time.time()
+    return {name: round(now - entry.get("fetched_at", 0))
+            for name, entry in load_cache().get("sources", {}).items()}
 
 def push_display(data, force=False):
-    """Push data to display only if it changed"""
-    # Get current display state
-    try:
-        r = requests.get(f"{DISPLAY_URL}/api/status", timeout=5)
-        if r.status_code == 200:
-            current = r.json().get("content", {})
-            # Fields that matter for display continuity
-            key_fields = ["current_event", "next_event", "next_event_time", "dinner", "countdown", "countdown_label"]
-            current_subset = {k: current.get(k) for k in key_fields}
-            new_subset = {k: data.get(k) for k in key_fields}
-            
-            # Don't push if new data has None/empty events but current has real events
-            # This prevents calendar API flakiness from clearing the display
-            if not force:
-                has_current_events = current_subset.get("next_event") and current_subset.get("next_event") != "None"
-                has_new_events = new_subset.get("next_event") and new_subset.get("next_event") != "None"
-                if has_current_events and not has_new_events:
-                    print("Skipping push: current has events but new data is empty (calendar likely flaky)")
-                    return
-            
-            if not force and current_subset == new_subset:
-                print("Data unchanged, skipping push")
-                return
+    """Push data to every display in one request each; the receiver skips the write if nothing changed.
+    
+    Returns {url: result}, with {"error": ...} for displays that failed.
+    """
+    payload = quickglance_payload(data, force)
+    results = {}
+    for url, (r, error) in post_displays("/api/update", payload).items():
+        try:
+            if error is not None:
+                raise Exception(error)
+            result = r.json()
+            if result.get("deferred"):
+                print(f"{_display_label(url)}Deferred: a message is on screen, "
+                      f"quickglance saved for when it ends")
+            elif result.get("changed") is False:
+                print(f"{_display_label(url)}Data unchanged, display at version {result.get('version')}")
             else:
-                print(f"Data changed: {current_subset} -> {new_subset}")
-    except Exception as e:
-        print(f"Status check error: {e}")
+                print(f"{_display_label(url)}Pushed: version {result.get('version')}")
+        except Exception as e:
+            print(f"{_display_label(url)}Push error: {e}")
+            result = {"error": str(e)}
+        results[url] = result
+    return results
+
+def push_popup(popup_data):
+    """Push a countdown popup for an upcoming event to every display"""
+    for url, (r, error) in post_displays("/api/message", popup_payload(popup_data)).items():
+        try:
+            if error is not None:
+                raise Exception(error)
+            print(f"{_display_label(url)}Popup pushed: {r.json()}")
+        except Exception as e:
+            print(f"{_display_label(url)}Popup error: {e}")
+
+# Daemon mode: seconds between quickglance rebuilds (sources refetch on their own SOURCE_TTL)
+DAEMON_INTERVAL = 60
+# Re-push unchanged content at least this often in case the receiver restarted
+DAEMON_REPUSH = 900
+
+def run_daemon(interval=DAEMON_INTERVAL):
+    """Stay resident, rebuilding every interval and pushing only on content change.
     
-    payload = {"mode": "quickglance", "title": "Quick Look", "content": data}
-    try:
-        r = requests.post(f"{DISPLAY_URL}/api/update", json=payload, timeout=10)
-        print(f"Pushed: {r.json()}")
-    except Exception as e:
-        print(f"Push error: {e}")
+    Each tick reuses the warm source cache, so a source is only refetched once
+    its SOURCE_TTL has passed. The cache stays in memory and is written to
+    disk once per tick at most. Exits cleanly on SIGTERM/SIGINT.
+    """
+    stop = threading.Event()
+    def handle_signal(signum, frame):
+        print(f"Received signal {signum}, shutting down...")
+        stop.set()
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    keep_cache_in_memory()
+    last_key = None
+    last_push = 0
+    print(f"Fetch daemon running (every {interval}s)")
+    while not stop.is_set():
+        try:
+            snapshot = build_snapshot()
+            data = build_quickglance(snapshot)
+            should_popup, popup_data = check_popup_routines(snapshot)
+            if should_popup and popup_data:
+                print(f"Triggering popup: {popup_data}")
+                push_popup(popup_data)
+            # While the popup is up the receiver saves this for when it ends
+            key = content_key(data)
+            if key != last_key or time.monotonic() - last_push >= DAEMON_REPUSH:
+                results = push_display(data)
+                # Retry next tick if any display missed it (the others skip it by content_hash)
+                if not any("error" in r for r in results.values()):
+                    last_key = key
+                    last_push = time.monotonic()
+        except Exception as e:
+            print(f"Daemon cycle error: {e}")
+        # Coalesces this tick's writes (and any background refreshes since the last one)
+        flush_cache()
+        stop.wait(interval)
+    
+    wait_for_refreshes(timeout=5)
+    flush_cache()
+    print("Fetch daemon stopped")
 
 import argparse
 
@@ -631,45 +1140,36 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch and push quick glance data")
     parser.add_argument("--force-template", action="store_true", help="Force push template to display")
     parser.add_argument("--force-push", action="store_true", help="Force push even if data unchanged")
+    parser.add_argument("--refresh", action="store_true", help="Ignore source TTLs and fetch everything fresh")
+    parser.add_argument("--daemon", action="store_true", help="Stay resident and push whenever content changes")
+    parser.add_argument("--interval", type=int, default=DAEMON_INTERVAL, help="Seconds between daemon rebuilds")
     args = parser.parse_args()
     
+    if args.daemon:
+        run_daemon(interval=args.interval)
+        sys.exit(0)
+    
+    print("Fetching data...")
+    snapshot = build_snapshot(use_cache=not args.refresh)
+    
     print("Building quick glance...")
-    data = build_quickglance()
+    data = build_quickglance(snapshot)
     print(json.dumps(data, indent=2))
     
     # Check for popup triggers
     print("\nChecking for popup triggers...")
-    should_popup, popup_data = check_popup_routines()
-    popup_mode = False
+    should_popup, popup_data = check_popup_routines(snapshot)
     if should_popup and popup_data:
         print(f"Triggering popup: {popup_data}")
-        # Push countdown popup
-        countdown_payload = {
-            "mode": "countdown",
-            "title": "Upcoming Event",
-            "content": {
-                "event": popup_data["event"],
-                "days": 0,
-                "hours": 0,
-                "minutes": int(popup_data["countdown"].replace("m", "").replace("h", " ").split()[0]) if "m" in popup_data["countdown"] else 0,
-                "message": f"Starts at {popup_data['time']}"
-            }
-        }
-        try:
-            r = requests.post(f"{DISPLAY_URL}/api/update", json=countdown_payload, timeout=10)
-            print(f"Popup pushed: {r.json()}")
-        except Exception as e:
-            print(f"Popup error: {e}")
-        
-        popup_mode = True
+        push_popup(popup_data)
     else:
         print("No popup triggers")
     
     print("\nPushing template...")
     push_template(force=args.force_template)
     print("\nPushing to display...")
-    if popup_mode:
-        print("Skipping quickglance push - popup is displaying")
-    else:
-        push_display(data, force=args.force_push)
-
+    # A popup on screen stays up; the receiver keeps this quickglance for when it ends
+    push_display(data, force=args.force_push)
+    
+    # Let stale-while-revalidate refreshes finish so the next run finds fresh values
+    wait_for_refreshes()
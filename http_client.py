@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+One pooled keep-alive session for Todoist, weather and display pushes,
+with default timeouts and retry/backoff on transient failures.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Seconds to wait for connect/read when a caller doesn't pass a timeout
+DEFAULT_TIMEOUT = 10
+
+# Retry connection errors and transient server errors with exponential backoff (0.5s, 1s).
+# Read and status retries are GET-only: a POST that timed out or got a 5xx may already
+# have been applied (same policy as push.py), so POSTs only retry failed connects.
+RETRY = Retry(
+    total=2,
+    connect=2,
+    read=1,
+    status=2,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+
+def _build_session():
+    """Build a session whose connection pools are reused across requests and threads"""
+    s = requests.Session()
+    # One pool per host: Todoist, wttr.in and each display
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=RETRY)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+session = _build_session()
+
+def get(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET through the shared session"""
+    return session.get(url, timeout=timeout, **kwargs)
+
+def post(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """POST through the shared session"""
+    return session.post(url, timeout=timeout, **kwargs)
+
+def get_json(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET a URL and decode the JSON body, raising on HTTP errors"""
+    r = get(url, timeout=timeout, **kwargs)
+    r.raise_for_status()
+    return r.json()
@@ -5,154 +5,335 @@ Push content to the Duet display from OpenClaw.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
 import json
 import sys
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Default URL - should be overridden via config or environment
+# (comma-separated to push to several displays at once)
 DEFAULT_URL = os.environ.get("DOBBY_DISPLAY_URL", "http://100.105.30.20:5000")
 
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+# Failed connects are retried with jittered exponential backoff (~0.5s, 1s, 2s)
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+class PushClient:
+    """Pushes to one display over a pooled keep-alive session.
+    
+    Reuse one client for a sequence of pushes so they share a connection:
+    
+        with PushClient("http://100.105.30.20:5000") as display:
+            display.push_quickglance(data)
+            display.push_message("Dinner is ready!", auto_dismiss=30)
+    
+    Only failed connects are retried: the request never reached the display,
+    so retrying can't apply it twice. Anything after the request was sent
+    (read timeouts, dropped connections, HTTP errors) is not.
+    """
+    
+    def __init__(self, url: str = DEFAULT_URL, timeout=DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = RETRY_BACKOFF):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        retry = Retry(total=None, connect=retries, read=0, status=0, other=0, redirect=0,
+                      allowed_methods=None, raise_on_status=False,
+                      backoff_factor=backoff, backoff_jitter=backoff)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request to the display (the session's adapter retries failed connects)"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.url}{path}", **kwargs)
+    
+    def call(self, method: str, path: str, payload=None) -> dict:
+        """Send a request and decode the JSON reply"""
+        r = self.request(method, path, json=payload)
+        try:
+            return r.json()
+        except:
+            return {"success": r.ok, "raw": r.text}
+    
+    def update(self, mode: str, title: str, content: dict, **fields) -> dict:
+        """POST /api/update (fields: speak, content_hash, merge)"""
+        return self.call("POST", "/api/update", {"mode": mode, "title": title, "content": content, **fields})
+    
+    def push_dashboard(self):
+        """Reset to dashboard mode"""
+        return self.call("GET", "/api/dashboard")
+    
+    def push_run(self, data: dict):
+        """Show running stats"""
+        return self.update("run", "🏃 Latest Run", data)
+    
+    def push_meals(self, data: dict):
+        """Show weekly meals"""
+        return self.update("meals", "🍽️ This Week's Meals", data)
+    
+    def push_routine(self, steps: list):
+        """Show a routine (bedtime, morning, etc.)"""
+        return self.update("routine", "Bedtime Routine", {"steps": steps})
+    
+    def push_custom(self, title: str, text: str, speak: str = None):
+        """Show custom content"""
+        return self.update("custom", title, {"text": text}, speak=speak)
+    
+    def push_quickglance(self, data: dict):
+        """Show quick glance dashboard"""
+        return self.update("quickglance", "Quick Look", data)
+    
+    def push_weather(self, temp: str, description: str, icon: str, nudge: str, time: str = ""):
+        """Show weather with nudge"""
+        return self.update("weather", "Weather", {
+            "temp": temp,
+            "description": description,
+            "icon": icon,
+            "nudge": nudge,
+            "time": time
+        })
+    
+    def push_celebration(self, name: str, age: str = "", date: str = "", icon: str = "🎂", message: str = ""):
+        """Show birthday/celebration"""
+        return self.update("celebration", "Celebration", {
+            "name": name,
+            "age": age,
+            "date": date,
+            "icon": icon,
+            "message": message
+        })
+    
+    def push_countdown(self, event: str, days: int = None, hours: int = None, minutes: int = None, message: str = ""):
+        """Show countdown to event"""
+        content = {"event": event, "message": message}
+        if days is not None: content["days"] = str(days)
+        if hours is not None: content["hours"] = str(hours)
+        if minutes is not None: content["minutes"] = str(minutes)
+        return self.update("countdown", "Countdown", content)
+    
+    def push_verse(self, text: str, reference: str = "", verse_type: str = "verse", label: str = ""):
+        """Show verse of the day or inspiration"""
+        return self.update("verse", "Verse", {
+            "type": verse_type,
+            "text": text,
+            "reference": reference,
+            "label": label
+        })
+    
+    def push_alert(self, message: str, severity: str = "info", title: str = "", details: list = None, action: str = ""):
+        """Show weather alert or announcement"""
+        return self.update("alert", title, {
+            "severity": severity,
+            "message": message,
+            "details": details or [],
+            "action": action
+        })
+    
+    def push_message(
+        self,
+        message: str,
+        message_type: str = "info",
+        sub_message: str = "",
+        auto_dismiss: int = 10,
+        sticky: bool = False,
+        color: str = None,
+        font_size: str = "4rem",
+        sub_size: str = "2rem",
+        speak: str = None,
+        countdown_to: str = None,
+        countdown_label: str = None
+    ):
+        """
+        Push a message to the display with auto-dismiss support.
+        
+        Args:
+            message: Main message text
+            message_type: info|warning|alert|celebration|sticky
+            sub_message: Optional subtitle
+            auto_dismiss: Seconds until auto-return to quickglance (0=stay forever)
+            sticky: If True, message stays until manually cleared (overrides auto_dismiss)
+            color: Custom hex color (optional)
+            font_size: Main message font size
+            sub_size: Sub-message font size
+            speak: Text to speak aloud via TTS
+            countdown_to: ISO datetime for countdown (e.g., "2025-02-15T10:00:00")
+            countdown_label: Label for countdown event
+        """
+        payload = {
+            "message": message,
+            "sub_message": sub_message,
+            "type": message_type,
+            "auto_dismiss": auto_dismiss,
+            "sticky": sticky,
+            "font_size": font_size,
+            "sub_size": sub_size
+        }
+        
+        if color:
+            payload["color"] = color
+        if speak:
+            payload["speak"] = speak
+        if countdown_to:
+            payload["countdown_to"] = countdown_to
+            payload["countdown_label"] = countdown_label or message
+        
+        return self.call("POST", "/api/message", payload)
+    
+    def clear_display(self):
+        """Clear current message and return to quickglance"""
+        return self.call("POST", "/api/clear-message")
+    
+    def push_template(self, template_name: str, content: str):
+        """Update a template file on the display"""
+        return self.call("POST", f"/api/template/{template_name}", {"content": content})
+    
+    def push_batch(self, operations: list):
+        """Apply a list of operations as one state change (see DisplayBatch)"""
+        return self.call("POST", "/api/batch", {"operations": operations})
+    
+    def batch(self):
+        """Start a DisplayBatch that sends through this client"""
+        return DisplayBatch(self)
+
+class DisplayGroup:
+    """Pushes to several displays concurrently.
+    
+    Has the same push_* methods as PushClient, each returning {url: result}.
+    A display that errors or hasn't answered within deadline seconds gets
+    {"success": False, "error": ...} and doesn't hold up the others; the
+    pushes share one thread pool and each display keeps its own connection.
+    """
+    
+    def __init__(self, urls: list, timeout=DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 deadline: float = None):
+        self.clients = [PushClient(url, timeout, retries) for url in urls]
+        # Per-display budget: by default one connect + read timeout
+        self.deadline = deadline or (sum(timeout) if isinstance(timeout, tuple) else timeout)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.clients), thread_name_prefix="push")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Close every display's connections without waiting on stragglers"""
+        self.executor.shutdown(wait=False)
+        for client in self.clients:
+            client.close()
+    
+    def fan_out(self, method: str, *args, **kwargs) -> dict:
+        """Call a PushClient method on every display at once; returns {url: result}"""
+        futures = {self.executor.submit(getattr(client, method), *args, **kwargs): client.url
+                   for client in self.clients}
+        done, _ = wait(futures, timeout=self.deadline)
+        results = {}
+        for future, url in futures.items():
+            if future not in done:
+                results[url] = {"success": False, "error": f"no response within {self.deadline:g}s"}
+            elif future.exception() is not None:
+                results[url] = {"success": False, "error": str(future.exception())}
+            else:
+                results[url] = future.result()
+        return results
+    
+    def __getattr__(self, name):
+        if name.startswith("push_") or name == "clear_display":
+            return functools.partial(self.fan_out, name)
+        raise AttributeError(name)
+    
+    def batch(self):
+        """Start a DisplayBatch that goes to every display"""
+        return DisplayBatch(self)
+
+def parse_urls(urls: str) -> list:
+    """Split a comma-separated list of display URLs"""
+    return [url.strip() for url in urls.split(",") if url.strip()]
+
+# Module-level shortcuts use one shared client for DEFAULT_URL (see set_url); with several
+# URLs it is a DisplayGroup and the functions return {url: result}
+_client = None
+
+def get_client():
+    """The shared client, created on first use"""
+    global _client
+    if _client is None:
+        urls = parse_urls(DEFAULT_URL)
+        _client = DisplayGroup(urls) if len(urls) > 1 else PushClient(urls[0])
+    return _client
+
+def set_url(url: str):
+    """Point the module-level functions at another display (or comma-separated displays)"""
+    global _client, DEFAULT_URL
+    if _client is not None:
+        _client.close()
+    _client = None
+    DEFAULT_URL = url
+
 def push_dashboard():
     """Reset to dashboard mode"""
-    r = requests.get(f"{DEFAULT_URL}/api/dashboard")
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    return get_client().push_dashboard()
 
 def push_run(data: dict):
     """Show running stats"""
-    payload = {
-        "mode": "run",
-        "title": "🏃 Latest Run",
-        "content": data
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_run(data)
 
 def push_meals(data: dict):
     """Show weekly meals"""
-    payload = {
-        "mode": "meals",
-        "title": "🍽️ This Week's Meals",
-        "content": data
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_meals(data)
 
 def push_routine(steps: list):
     """Show a routine (bedtime, morning, etc.)"""
-    payload = {
-        "mode": "routine",
-        "title": "Bedtime Routine",
-        "content": {"steps": steps}
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_routine(steps)
 
 def push_custom(title: str, text: str, speak: str = None):
     """Show custom content"""
-    payload = {
-        "mode": "custom",
-        "title": title,
-        "content": {"text": text},
-        "speak": speak
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    return get_client().push_custom(title, text, speak)
 
 def push_quickglance(data: dict):
     """Show quick glance dashboard"""
-    payload = {
-        "mode": "quickglance",
-        "title": "Quick Look",
-        "content": data
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    return get_client().push_quickglance(data)
 
 def push_weather(temp: str, description: str, icon: str, nudge: str, time: str = ""):
     """Show weather with nudge"""
-    payload = {
-        "mode": "weather",
-        "title": "Weather",
-        "content": {
-            "temp": temp,
-            "description": description,
-            "icon": icon,
-            "nudge": nudge,
-            "time": time
-        }
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_weather(temp, description, icon, nudge, time)
 
 def push_celebration(name: str, age: str = "", date: str = "", icon: str = "🎂", message: str = ""):
     """Show birthday/celebration"""
-    payload = {
-        "mode": "celebration",
-        "title": "Celebration",
-        "content": {
-            "name": name,
-            "age": age,
-            "date": date,
-            "icon": icon,
-            "message": message
-        }
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_celebration(name, age, date, icon, message)
 
 def push_countdown(event: str, days: int = None, hours: int = None, minutes: int = None, message: str = ""):
     """Show countdown to event"""
-    content = {"event": event, "message": message}
-    if days is not None: content["days"] = str(days)
-    if hours is not None: content["hours"] = str(hours)
-    if minutes is not None: content["minutes"] = str(minutes)
-    payload = {
-        "mode": "countdown",
-        "title": "Countdown",
-        "content": content
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_countdown(event, days, hours, minutes, message)
 
 def push_verse(text: str, reference: str = "", verse_type: str = "verse", label: str = ""):
     """Show verse of the day or inspiration"""
-    payload = {
-        "mode": "verse",
-        "title": "Verse",
-        "content": {
-            "type": verse_type,
-            "text": text,
-            "reference": reference,
-            "label": label
-        }
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_verse(text, reference, verse_type, label)
 
 def push_alert(message: str, severity: str = "info", title: str = "", details: list = None, action: str = ""):
     """Show weather alert or announcement"""
-    payload = {
-        "mode": "alert",
-        "title": title,
-        "content": {
-            "severity": severity,
-            "message": message,
-            "details": details or [],
-            "action": action
-        }
-    }
-    r = requests.post(f"{DEFAULT_URL}/api/update", json=payload)
-    return r.json()
+    return get_client().push_alert(message, severity, title, details, action)
 
 def push_message(
     message: str,
@@ -167,68 +348,72 @@ def push_message(
     countdown_to: str = None,
     countdown_label: str = None
 ):
-    """
-    Push a message to the display with auto-dismiss support.
-    
-    Args:
-        message: Main message text
-        message_type: info|warning|alert|celebration|sticky
-        sub_message: Optional subtitle
-        auto_dismiss: Seconds until auto-return to quickglance (0=stay forever)
-        sticky: If True, message stays until manually cleared (overrides auto_dismiss)
-        color: Custom hex color (optional)
-        font_size: Main message font size
-        sub_size: Sub-message font size
-        speak: Text to speak aloud via TTS
-        countdown_to: ISO datetime for countdown (e.g., "2025-02-15T10:00:00")
-        countdown_label: Label for countdown event
-    """
-    payload = {
-        "message": message,
-        "sub_message": sub_message,
-        "type": message_type,
-        "auto_dismiss": auto_dismiss,
-        "sticky": sticky,
-        "font_size": font_size,
-        "sub_size": sub_size
-    }
-    
-    if color:
-        payload["color"] = color
-    if speak:
-        payload["speak"] = speak
-    if countdown_to:
-        payload["countdown_to"] = countdown_to
-        payload["countdown_label"] = countdown_label or message
-    
-    r = requests.post(f"{DEFAULT_URL}/api/message", json=payload)
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    """Push a message to the display with auto-dismiss support (see PushClient.push_message)"""
+    return get_client().push_message(message, message_type, sub_message, auto_dismiss, sticky, color,
+                                     font_size, sub_size, speak, countdown_to, countdown_label)
 
 def clear_display():
     """Clear current message and return to quickglance"""
-    r = requests.post(f"{DEFAULT_URL}/api/clear-message")
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    return get_client().clear_display()
 
 def push_template(template_name: str, content: str):
     """Update a template file on the display"""
-    r = requests.post(f"{DEFAULT_URL}/api/template/{template_name}", json={"content": content})
-    try:
-        return r.json()
-    except:
-        return {"success": True, "raw": r.text}
+    return get_client().push_template(template_name, content)
+
+class DisplayBatch:
+    """Collect display operations and send them as one /api/batch request.
+    
+    The display applies them together and publishes one new version, so it
+    never shows the states in between:
+    
+        batch = DisplayBatch()
+        batch.update("quickglance", "Quick Look", data)
+        batch.message("Dinner is ready!", auto_dismiss=30)
+        batch.config(font_scale=1.2)
+        result = batch.send()
+    """
+    
+    def __init__(self, client: PushClient = None):
+        self.client = client or get_client()
+        self.operations = []
+    
+    def update(self, mode: str, title: str, content: dict, **fields):
+        """Queue an /api/update (fields: speak, content_hash, merge)"""
+        self.operations.append({"op": "update", "mode": mode, "title": title, "content": content, **fields})
+        return self
+    
+    def message(self, message: str, message_type: str = "info", **fields):
+        """Queue an /api/message (fields as for push_message's payload)"""
+        self.operations.append({"op": "message", "message": message, "type": message_type, **fields})
+        return self
+    
+    def clear_message(self, message_id: int = None):
+        """Queue clearing the current message (only message_id, if given)"""
+        op = {"op": "clear_message"}
+        if message_id is not None:
+            op["id"] = message_id
+        self.operations.append(op)
+        return self
+    
+    def config(self, **changes):
+        """Queue a config change (font sizes etc.)"""
+        self.operations.append({"op": "config", **changes})
+        return self
+    
+    def send(self):
+        """Send the queued operations; the batch is emptied either way"""
+        operations, self.operations = self.operations, []
+        if not operations:
+            return {"success": True, "changed": False, "results": []}
+        return self.client.push_batch(operations)
 
 def main():
     parser = argparse.ArgumentParser(description="Push content to Dobby Display")
-    parser.add_argument("--url", default=DEFAULT_URL, help="Display receiver URL")
+    parser.add_argument("--url", default=DEFAULT_URL,
+                        help="Display receiver URL (comma-separated to push to several displays)")
     parser.add_argument("--mode", required=True, 
-                        choices=["dashboard", "run", "meals", "routine", "custom", "quickglance", "message", "clear"])
-    parser.add_argument("--data", help="JSON data for the content")
+                        choices=["dashboard", "run", "meals", "routine", "custom", "quickglance", "message", "clear", "batch"])
+    parser.add_argument("--data", help="JSON data for the content (batch: a list of operations)")
     parser.add_argument("--title", help="Title for custom mode")
     parser.add_argument("--speak", help="Text to speak aloud")
     
@@ -248,7 +433,7 @@ def main():
     
     args = parser.parse_args()
     
-    url = args.url if args.url else DEFAULT_URL
+    set_url(args.url or DEFAULT_URL)
     
     try:
         if args.mode == "dashboard":
@@ -281,8 +466,14 @@ def main():
             )
         elif args.mode == "clear":
             result = clear_display()
+        elif args.mode == "batch":
+            batch = DisplayBatch()
+            batch.operations = json.loads(args.data) if args.data else []
+            result = batch.send()
         
         print(json.dumps(result, indent=2))
+        if isinstance(get_client(), DisplayGroup) and all(r.get("success") is False for r in result.values()):
+            sys.exit(1)
     except Exception as e:
         print(json.dumps({"error": str(e)}), file=sys.stderr)
         sys.exit(1)
@@ -5,18 +5,35 @@ A simple Flask server that displays content pushed from Dobby.
 Runs on the Lenovo Duet Chromebook.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect
+from flask import Flask, render_template, request, jsonify, redirect, Response, url_for, g
 import os
+import sys
 import json
+import atexit
 import logging
 import threading
-from datetime import datetime
-from jinja2 import ChoiceLoader, FileSystemLoader
+import copy
+import heapq
+import itertools
+import time
+import gzip
+import hashlib
+import argparse
+from collections import OrderedDict
+from datetime import datetime, timezone
+from jinja2 import ChoiceLoader, FileSystemLoader, FileSystemBytecodeCache, TemplateSyntaxError
+import metrics
 
 app = Flask(__name__)
-app.config['TEMPLATES_AUTO_RELOAD'] = True
+# Templates are compiled once at startup and only recompiled when /api/template replaces one,
+# so renders never stat the template files
+app.config['TEMPLATES_AUTO_RELOAD'] = False
 CUSTOM_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "custom_templates")
 os.makedirs(CUSTOM_TEMPLATE_DIR, exist_ok=True)
+# Compiled template bytecode survives restarts (entries are keyed by source checksum)
+TEMPLATE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jinja")
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)}
 default_loader = app.jinja_loader or FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates"))
 app.jinja_loader = ChoiceLoader([
     FileSystemLoader(CUSTOM_TEMPLATE_DIR),
@@ -25,8 +42,8 @@ app.jinja_loader = ChoiceLoader([
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Config file path
-CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
+# Config file path (overridable so the benchmarks can run without touching it)
+CONFIG_FILE = os.environ.get("DOBBY_CONFIG_FILE", os.path.join(os.path.dirname(__file__), "config.json"))
 
 # Default config for font sizes
 DEFAULT_CONFIG = {
@@ -73,10 +90,304 @@ display_state = {
 # Store quickglance data separately so it persists across message dismissal
 quickglance_content = {}
 
+# Display state survives restarts via a snapshot file, written atomically and coalesced
+# so a burst of updates costs one write at most every SNAPSHOT_DELAY seconds
+STATE_FILE = os.environ.get("DOBBY_STATE_FILE",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "display_state.json"))
+SNAPSHOT_DELAY = 2
+snapshot_job = None
+snapshot_lock = threading.Lock()
+
+# Boot timing, reported on /health: was state restored, and how long until a page with real content
+BOOT_TIME = time.monotonic()
+boot_stats = {"restored": False, "snapshot_age": None, "first_paint_ms": None}
+
+def load_snapshot():
+    """Restore display_state and quickglance_content from the last snapshot, if any"""
+    global display_state, quickglance_content
+    try:
+        with open(STATE_FILE) as f:
+            snap = json.load(f)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.error(f"Failed to load state snapshot: {e}")
+        return
+    display_state = snap.get("display_state") or display_state
+    quickglance_content = snap.get("quickglance_content") or {}
+    boot_stats["restored"] = True
+    boot_stats["snapshot_age"] = round(time.time() - snap.get("saved_at", time.time()))
+    logger.info(f"Restored {display_state.get('mode')} state from snapshot ({boot_stats['snapshot_age']}s old)")
+
+def save_snapshot():
+    """Write the current state to STATE_FILE atomically (temp file + rename)"""
+    global snapshot_job
+    with state_changed:
+        snapshot_job = None
+        state = display_state
+        if current_message is not None:
+            # Queued messages don't survive a restart; come back to quickglance instead
+            state = {"mode": "quickglance", "title": "Quick Look",
+                     "content": quickglance_content, "updated": display_state.get("updated")}
+        data = json.dumps({"display_state": state, "quickglance_content": quickglance_content,
+                           "saved_at": time.time()})
+    with snapshot_lock:
+        try:
+            os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+            tmp_path = STATE_FILE + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, STATE_FILE)
+        except Exception as e:
+            logger.error(f"Failed to save state snapshot: {e}")
+
+def schedule_snapshot():
+    """Save a snapshot soon, folding any further changes before then into the same write"""
+    global snapshot_job
+    with state_changed:
+        if snapshot_job is None:
+            snapshot_job = scheduler.schedule(SNAPSHOT_DELAY, save_snapshot)
+
+# Restore before anything reads display_state, so the first render has real content
+load_snapshot()
+atexit.register(save_snapshot)
+
+# Bumped on every display_state change; /api/stream listeners wait on state_changed
+state_version = 0
+state_changed = threading.Condition()
+state_modified = datetime.now(timezone.utc)
+# content_hash sent with the last /api/update (None once anything else changes the state)
+state_content_hash = None
+# Versions restart at 0 with the process, so ETags carry a per-boot prefix
+BOOT_ID = format(int(state_modified.timestamp()), "x")
+
+# Bumped on every config change (the rendered page depends on it too)
+config_version = 0
+config_modified = state_modified
+
+# Bumped whenever templates change on disk (uploads, /api/reload-templates)
+template_generation = 0
+template_modified = state_modified
+
+# Rendered display.html pages keyed by (state version, config version, template generation)
+PAGE_CACHE_SIZE = 8
+page_cache = OrderedDict()
+page_cache_lock = threading.Lock()
+
+# /api/status body serialized once per state version
+_status_cache = {"version": None, "body": None}
+
+# Recent display_state copies by version, so clients can fetch just the fields that changed
+STATE_HISTORY_SIZE = 16
+state_history = OrderedDict([(0, copy.deepcopy(display_state))])
+# Config version each of those state versions was published with (a config change needs a full reload)
+config_history = {0: 0}
+
+# Seconds between SSE keepalive comments (keeps proxies/the tablet from dropping the stream)
+STREAM_KEEPALIVE = 15
+
+# /metrics instrumentation (gauges are read at scrape time, see metrics_endpoint)
+request_count = metrics.Counter("dobby_http_requests_total", "HTTP requests by route, method and status",
+                                ("route", "method", "status"))
+request_latency = metrics.Histogram("dobby_http_request_duration_seconds",
+                                    "Time to build each response, by route", ("route",))
+render_latency = metrics.Histogram("dobby_render_duration_seconds",
+                                   "display.html render time on a page cache miss, by mode", ("mode",))
+page_cache_lookups = metrics.Counter("dobby_page_cache_lookups_total", "Rendered page cache lookups",
+                                     ("result",))
+# time.time() of the last /api/update, /api/message or /api/batch
+last_push = None
+
+class Scheduler:
+    """Runs timed callbacks from a heap on one thread, instead of a Timer thread per call"""
+    
+    def __init__(self):
+        self._heap = []
+        self._cond = threading.Condition()
+        self._ids = itertools.count(1)
+        self._thread = None
+    
+    def schedule(self, delay, fn, *args):
+        """Run fn(*args) after delay seconds; returns an id for cancel()"""
+        with self._cond:
+            job_id = next(self._ids)
+            heapq.heappush(self._heap, (time.monotonic() + delay, job_id, fn, args))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job_id
+    
+    def cancel(self, job_id):
+        """Drop a pending job (no-op if it already ran)"""
+        with self._cond:
+            self._heap = [job for job in self._heap if job[1] != job_id]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+    
+    def pending(self):
+        """Number of jobs waiting to run"""
+        with self._cond:
+            return len(self._heap)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                due, job_id, fn, args = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f"Scheduled job failed: {e}")
+
+scheduler = Scheduler()
+
+# Scheduler id of the pending auto-dismiss; any state change supersedes it
+pending_dismiss = None
+# Identifies the scheduled queue resume (see resume_queue); None once it is superseded
+resume_token = None
+
+# Message queue: higher priority preempts lower; equal priorities wait their turn
+MESSAGE_PRIORITY = {"info": 0, "celebration": 1, "countdown": 1, "warning": 2, "alert": 3}
+STICKY_PRIORITY = 3
+MESSAGE_QUEUE_SIZE = 20
+# Seconds a queued message may wait before it's dropped (sticky messages never expire)
+DEFAULT_MESSAGE_EXPIRY = 600
+# Messages without auto_dismiss give way to waiting messages after this many seconds
+ROTATE_SECONDS = 15
+
+message_queue = []  # waiting items, in display order
+current_message = None  # item on screen, None when showing anything else
+_message_ids = itertools.count(1)
+
+# Set (False, then True once anything changes) while /api/batch applies its operations:
+# state changes are collected and published together as one version
+batch_changed = None
+
+def set_display_state(state, content_hash=None, quickglance=None, message=None):
+    """Atomically replace display_state and publish it as a new version.
+    
+    All state changes go through here: the version bump, history, SSE wake-up
+    and cancelling a superseded auto-dismiss happen under one lock.
+    Pass quickglance to also replace the saved quickglance content.
+    message is the queue item being put on screen (see show_message). Any other
+    state puts a displaced message back at the front of the queue, and waiting
+    messages resume after ROTATE_SECONDS instead of being stranded.
+    Returns the new version (inside a batch, the version the batch will publish).
+    """
+    global display_state, quickglance_content, state_content_hash, pending_dismiss
+    global current_message, batch_changed, resume_token
+    with state_changed:
+        # A replaced message's dismissal is superseded; with no message on screen the
+        # pending job is the queue resuming, which further non-message states leave alone
+        if pending_dismiss is not None and (message is not None or current_message is not None):
+            scheduler.cancel(pending_dismiss)
+            pending_dismiss = resume_token = None
+        if message is None:
+            if current_message is not None:
+                message_queue.insert(0, current_message)
+            _drop_expired()
+            if message_queue and pending_dismiss is None:
+                resume_token = object()
+                pending_dismiss = scheduler.schedule(ROTATE_SECONDS, resume_queue, resume_token)
+        current_message = message
+        display_state = state
+        if quickglance is not None:
+            quickglance_content = quickglance
+        state_content_hash = content_hash
+        if batch_changed is not None:
+            batch_changed = True
+            return state_version + 1
+        return publish_state()
+
+def publish_state():
+    """Bump the version for the current display_state and wake listeners"""
+    global state_version, state_modified
+    with state_changed:
+        state_version += 1
+        state_modified = datetime.now(timezone.utc)
+        state_history[state_version] = copy.deepcopy(display_state)
+        config_history[state_version] = config_version
+        while len(state_history) > STATE_HISTORY_SIZE:
+            config_history.pop(state_history.popitem(last=False)[0], None)
+        state_changed.notify_all()
+        version = state_version
+    schedule_snapshot()
+    # Pages for older versions can never be served again
+    invalidate_pages(lambda key: key[0] < version)
+    return version
+
+def invalidate_pages(stale=lambda key: True):
+    """Drop cached rendered pages whose key matches stale (default: all)"""
+    with page_cache_lock:
+        for key in [k for k in page_cache if stale(k)]:
+            del page_cache[key]
+
+def render_page():
+    """Render display.html for the current state, reusing a cached copy when nothing changed.
+    
+    Returns (key, html). The page is rendered from the state_history copy of the
+    version so a concurrent update can't end up cached under the wrong key.
+    """
+    with state_changed:
+        version = state_version
+        state = state_history.get(version, display_state)
+        config_seen = config_version
+    key = (version, config_seen, template_generation)
+    with page_cache_lock:
+        html = page_cache.get(key)
+        if html is not None:
+            page_cache.move_to_end(key)
+            page_cache_lookups.inc("hit")
+            return key, html
+    page_cache_lookups.inc("miss")
+    start = time.perf_counter()
+    html = render_template('display.html', state=state, config=config, version=version,
+                           config_version=config_seen)
+    render_latency.observe(time.perf_counter() - start, state.get("mode"))
+    with page_cache_lock:
+        page_cache[key] = html
+        while len(page_cache) > PAGE_CACHE_SIZE:
+            page_cache.popitem(last=False)
+    return key, html
+
+def conditional_response(etag, last_modified, build, mimetype):
+    """Answer 304 when the client's ETag/If-Modified-Since still match, else build the body"""
+    resp = app.response_class(mimetype=mimetype)
+    if mimetype in COMPRESS_MIMETYPES and wants_gzip():
+        # The gzip body gets its own ETag, so conditional requests never mix the two encodings
+        etag += GZIP_ETAG_SUFFIX
+    resp.set_etag(etag)
+    resp.last_modified = last_modified
+    # Always revalidate - a 304 is cheap, a stale display is not
+    resp.cache_control.no_cache = True
+    resp.make_conditional(request)
+    if resp.status_code != 304:
+        resp.set_data(build())
+    return resp
+
 @app.route('/')
 def index():
     """Main display page - renders based on current mode"""
-    return render_template('display.html', state=display_state, config=config)
+    resp = conditional_response(
+        f"{BOOT_ID}-s{state_version}-c{config_version}-t{template_generation}",
+        max(state_modified, config_modified, template_modified),
+        lambda: render_page()[1],
+        'text/html',
+    )
+    if boot_stats["first_paint_ms"] is None and resp.status_code == 200 and display_state.get("content"):
+        boot_stats["first_paint_ms"] = round((time.monotonic() - BOOT_TIME) * 1000)
+        logger.info(f"First page with content served {boot_stats['first_paint_ms']} ms after start "
+                    f"({'restored from snapshot' if boot_stats['restored'] else 'no snapshot'})")
+    return resp
 
 @app.route('/config')
 def config_page():
@@ -86,26 +397,110 @@ def config_page():
 @app.route('/api/status')
 def status():
     """Return current display state"""
-    return jsonify(display_state)
+    with state_changed:
+        version = state_version
+        if _status_cache["version"] != version:
+            _status_cache["version"] = version
+            _status_cache["body"] = app.json.dumps(display_state)
+        body = _status_cache["body"]
+    resp = conditional_response(f"{BOOT_ID}-s{version}", state_modified, lambda: body, 'application/json')
+    resp.headers['X-State-Version'] = str(version)
+    return resp
+
+def stream_payload(version):
+    """Small summary of the current state sent with each stream event"""
+    content = display_state.get("content") or {}
+    return {
+        "version": version,
+        "config": config_version,
+        "mode": display_state.get("mode"),
+        "updated": display_state.get("updated"),
+        "content": {"speak": content.get("speak")} if isinstance(content, dict) and content.get("speak") else {},
+    }
+
+@app.route('/api/diff')
+def state_diff():
+    """Field-level content changes since ?since=<version>.
+    
+    Returns full=true when the client has to reload instead: the old version
+    has aged out of the history, or the mode or config changed.
+    """
+    since = request.args.get('since', type=int)
+    with state_changed:
+        version = state_version
+        old = state_history.get(since)
+        current = state_history[version]
+        config_changed = config_history.get(since) != config_history[version]
+    result = {"version": version, "since": since, "mode": current.get("mode"), "updated": current.get("updated"),
+              "config": config_history[version]}
+    old_content = old.get("content") if old else None
+    new_content = current.get("content")
+    if (old is None or config_changed
+            or old.get("mode") != current.get("mode") or old.get("title") != current.get("title")
+            or not isinstance(old_content, dict) or not isinstance(new_content, dict)):
+        return jsonify({**result, "full": True})
+    changed = {k: v for k, v in new_content.items() if k not in old_content or old_content[k] != v}
+    removed = [k for k in old_content if k not in new_content]
+    return jsonify({**result, "full": False, "changed": changed, "removed": removed})
+
+@app.route('/api/stream')
+def stream():
+    """Server-Sent Events stream: one 'state' event per display_state change"""
+    def events():
+        with state_changed:
+            seen = state_version
+        yield "retry: 3000\n\n"
+        yield f"event: state\ndata: {json.dumps(stream_payload(seen))}\n\n"
+        while True:
+            with state_changed:
+                state_changed.wait_for(lambda: state_version != seen, timeout=STREAM_KEEPALIVE)
+                version = state_version
+            if version == seen:
+                yield ": keepalive\n\n"
+                continue
+            seen = version
+            yield f"event: state\ndata: {json.dumps(stream_payload(version))}\n\n"
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/refresh', methods=['POST'])
 def refresh():
     """Refresh data from external sources"""
-    global display_state
-    
     # This would normally call external APIs
-    # For now, just update the timestamp
-    display_state["updated"] = datetime.now().isoformat()
-    return jsonify({"success": True, "state": display_state})
+    # For now, just update the timestamp (same screen, so a pending auto-dismiss still runs)
+    global display_state
+    with state_changed:
+        display_state = {**display_state, "updated": datetime.now().isoformat()}
+        publish_state()
+        state = display_state
+    return jsonify({"success": True, "state": state})
 
 @app.route('/api/update', methods=['POST'])
 def update():
-    """Update the display content"""
-    global display_state, quickglance_content
+    """Update the display content
+    
+    Optional conditional-write fields, so a pusher needs only one request:
+        "content_hash": "..."      # skip the write if it matches the hash of the last update
+        "merge": "keep_events"     # keep the current quickglance events if the new ones are empty
+    An If-Match header (an ETag from /api/status) makes the write fail with 412
+    if the state has moved on. The response reports "changed" and "version".
     
+    While a queued message is on screen, quickglance updates are saved for when
+    the queue empties instead of replacing the message.
+    """
     data = request.json
     if not data:
         return jsonify({"error": "No data provided"}), 400
+    mark_push()
+    result, status_code = apply_update(data, request.if_match)
+    return jsonify(result), status_code
+
+def apply_update(data, if_match=None):
+    """Apply an /api/update payload; returns (response dict, HTTP status).
+    
+    Shared by the HTTP endpoint and in-process pushers (the warm-start fetch).
+    """
+    global quickglance_content
     
     # Defensive: ensure content is always a dict
     content = data.get("content", {})
@@ -114,31 +509,70 @@ def update():
         content = {}
     
     mode = data.get("mode", "custom")
+    title = data.get("title", "Dobby Display")
+    content_hash = data.get("content_hash")
     
-    # Store quickglance data so it persists across message dismissal
-    if mode == "quickglance":
-        quickglance_content = content
+    with state_changed:
+        if if_match and not if_match.contains(f"{BOOT_ID}-s{state_version}"):
+            return {"error": "State changed", "version": state_version}, 412
+        
+        if (content_hash and content_hash == state_content_hash
+                and display_state.get("mode") == mode and display_state.get("title") == title):
+            return {"success": True, "changed": False, "version": state_version, "state": display_state}, 200
+        
+        if mode == "quickglance" and current_message is not None:
+            if data.get("merge") == "keep_events":
+                content = merge_keep_events({"mode": "quickglance", "content": quickglance_content}, content)
+            quickglance_content = content
+            schedule_snapshot()
+            return {"success": True, "changed": False, "deferred": True,
+                    "version": state_version, "state": display_state}, 200
+        
+        if data.get("merge") == "keep_events" and mode == "quickglance":
+            content = merge_keep_events(display_state, content)
+        
+        state = {
+            "mode": mode,
+            "title": title,
+            "content": content,
+            "updated": datetime.now().isoformat()
+        }
+        # Store quickglance data so it persists across message dismissal
+        version = set_display_state(state, content_hash=content_hash,
+                                    quickglance=content if mode == "quickglance" else None)
     
-    display_state = {
-        "mode": mode,
-        "title": data.get("title", "Dobby Display"),
-        "content": content,
-        "updated": datetime.now().isoformat()
-    }
+    logger.info(f"Display updated: {mode} - {title}")
+    return {"success": True, "changed": True, "version": version, "state": state}, 200
+
+# Quickglance fields that come from the calendar
+EVENT_FIELDS = ("current_event", "current_event_time", "current_location",
+                "next_event", "next_event_time", "next_location")
+
+def merge_keep_events(current, content):
+    """Keep the current calendar fields when new quickglance data has no events.
     
-    logger.info(f"Display updated: {display_state['mode']} - {display_state['title']}")
-    return jsonify({"success": True, "state": display_state})
+    Stops calendar API flakiness from blanking the display while still letting
+    dinner, weather and tasks update.
+    """
+    current_content = current.get("content") or {}
+    if current.get("mode") != "quickglance" or not isinstance(current_content, dict):
+        return content
+    has_current_events = current_content.get("next_event") not in (None, "", "None")
+    has_new_events = content.get("next_event") not in (None, "", "None")
+    if has_current_events and not has_new_events:
+        logger.info("Keeping current events: new quickglance data has none (calendar likely flaky)")
+        return {**content, **{k: current_content.get(k) for k in EVENT_FIELDS if k in current_content}}
+    return content
 
 @app.route('/api/dashboard')
 def dashboard():
     """Set display to dashboard mode"""
-    global display_state
-    display_state = {
+    set_display_state({
         "mode": "dashboard",
         "title": "Family Dashboard",
         "content": {},
         "updated": datetime.now().isoformat()
-    }
+    })
     return jsonify({"success": True})
 
 @app.route('/api/clear')
@@ -148,21 +582,124 @@ def clear():
 
 @app.route('/api/template/<template_name>', methods=['POST'])
 def update_template(template_name):
-    """Update a template file directly"""
-    import os
+    """Update a template file directly.
+    
+    The new source is compiled first, so a broken template is rejected (400) and
+    the current one keeps rendering. Takes effect immediately, no reload needed.
+    """
     content = request.json.get('content', '')
     safe_name = os.path.basename(template_name)
     if not safe_name.endswith('.html'):
         safe_name += '.html'
+    try:
+        app.jinja_env.compile(content, name=safe_name)
+    except TemplateSyntaxError as e:
+        logger.warning(f"Rejected template {safe_name}: {e.message} (line {e.lineno})")
+        return jsonify({"success": False, "template": safe_name,
+                        "error": e.message, "line": e.lineno}), 400
     template_path = os.path.join(CUSTOM_TEMPLATE_DIR, safe_name)
-    with open(template_path, 'w') as f:
+    # Write beside the target and swap it in, so a render never sees a half-written file
+    tmp_path = template_path + ".tmp"
+    with open(tmp_path, 'w') as f:
         f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, template_path)
+    templates_changed([safe_name])
     return jsonify({"success": True, "template": safe_name})
 
+def compile_templates(names=None):
+    """Load templates (default: all) into the Jinja cache, compiling through the bytecode cache"""
+    env = app.jinja_env
+    for name in names or env.list_templates(extensions=["html"]):
+        try:
+            env.get_template(name)
+        except Exception as e:
+            logger.error(f"Template {name} failed to compile: {e}")
+
+def templates_changed(names=None):
+    """Recompile the changed templates (default: all) and drop every cached page.
+    
+    Also bumps the template generation so no cached page outlives a template change.
+    """
+    global template_generation, template_modified
+    cache = app.jinja_env.cache
+    if names is None:
+        cache.clear()
+    else:
+        # Jinja keys cached templates by (loader, name)
+        for key in [k for k in cache.keys() if k[1] in names]:
+            del cache[key]
+    compile_templates(names)
+    template_generation += 1
+    template_modified = datetime.now(timezone.utc)
+    invalidate_pages()
+
 @app.route('/health')
 def health():
-    """Health check endpoint"""
-    return jsonify({"status": "ok", "time": datetime.now().isoformat()})
+    """Health check endpoint: readiness of the warm-start fetch and the age of each data source"""
+    sources = {}
+    if "fetch_data" in sys.modules:
+        try:
+            sources = sys.modules["fetch_data"].source_ages()
+        except Exception as e:
+            logger.error(f"Source age lookup failed: {e}")
+    return jsonify({
+        "status": "ok",
+        "readiness": warm_state["status"],
+        "warm_error": warm_state["error"],
+        "warm_finished": warm_state["finished"],
+        "source_age_seconds": sources,
+        "time": datetime.now().isoformat(),
+        "boot": boot_stats,
+    })
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(resp):
+    """Count the request and its latency under its route pattern (not the raw path, to bound labels)"""
+    start = getattr(g, "request_start", None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        request_latency.observe(time.perf_counter() - start, route)
+        request_count.inc(route, request.method, resp.status_code)
+    return resp
+
+def mark_push():
+    """Note that a pusher just sent something (for dobby_last_push_age_seconds)"""
+    global last_push
+    last_push = time.time()
+
+def _display_state_bytes():
+    with state_changed:
+        return len(app.json.dumps(display_state).encode())
+
+def _last_push_age():
+    return round(time.time() - last_push, 3) if last_push else None
+
+SCRAPE_GAUGES = [
+    metrics.Gauge("dobby_state_version", "Current display_state version", lambda: state_version),
+    metrics.Gauge("dobby_display_state_bytes", "Size of display_state serialized as JSON", _display_state_bytes),
+    metrics.Gauge("dobby_auto_dismiss_pending", "1 while an auto-dismiss/rotation timer is pending",
+                  lambda: int(pending_dismiss is not None)),
+    metrics.Gauge("dobby_scheduler_pending_jobs", "Timed jobs waiting to run (auto-dismiss, snapshots)",
+                  lambda: scheduler.pending()),
+    metrics.Gauge("dobby_message_queue_length", "Messages waiting behind the current one",
+                  lambda: len(message_queue)),
+    metrics.Gauge("dobby_last_push_age_seconds", "Seconds since the last /api/update, /api/message or /api/batch",
+                  _last_push_age),
+    metrics.Gauge("dobby_uptime_seconds", "Seconds since the receiver started",
+                  lambda: round(time.monotonic() - BOOT_TIME, 3)),
+]
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics"""
+    body = metrics.render([request_count, request_latency, render_latency, page_cache_lookups] + SCRAPE_GAUGES)
+    return Response(body, content_type=metrics.CONTENT_TYPE)
 
 @app.route('/api/message', methods=['POST'])
 def send_message():
@@ -179,12 +716,28 @@ def send_message():
         "countdown_to": "2025-01-15T10:00:00",  # ISO datetime for countdown
         "countdown_label": "Church",  # label for countdown event
         "sticky": false,  # if true, stays until manually cleared
-        "color": "#667eea"  # optional custom color
+        "color": "#667eea",  # optional custom color
+        "priority": 2,  # optional; defaults by type (alert/sticky 3 > warning 2 > celebration/countdown 1 > info 0)
+        "expires": 600  # optional; seconds it may wait in the queue before being dropped
     }
+    
+    Messages are queued: a higher priority preempts what's on screen, otherwise
+    it waits its turn. See /api/queue.
     """
-    global display_state
-    data = request.json or {}
+    mark_push()
+    item = build_message(request.json or {})
+    with state_changed:
+        dropped = enqueue_message(item)
+        showing = current_message is item
+    
+    logger.info(f"Message queued: id={item['id']} type={item['type']} priority={item['priority']} "
+                f"sticky={item['sticky']} duration={item['duration']} showing={showing}")
     
+    return jsonify({"success": True, "id": item["id"], "showing": showing, "dropped": dropped,
+                    "queue_length": len(message_queue), "state": item["state"]})
+
+def build_message(data):
+    """Turn an /api/message payload into a queue item"""
     message_type = data.get("type", "info")
     auto_dismiss = int(data.get("auto_dismiss", 0))
     sticky = data.get("sticky", False)
@@ -274,31 +827,157 @@ def send_message():
             "auto_dismiss": auto_dismiss
         }
     
-    display_state = {
+    state = {
         "mode": display_mode,
         "title": data.get("title", "Message"),
         "content": content,
         "updated": datetime.now().isoformat()
     }
+    priority = data.get("priority")
+    if priority is None:
+        priority = STICKY_PRIORITY if sticky else MESSAGE_PRIORITY.get(message_type, 0)
+    expires = data.get("expires", None if sticky else DEFAULT_MESSAGE_EXPIRY)
+    item = {
+        "id": next(_message_ids),
+        "type": message_type,
+        "priority": int(priority),
+        "duration": 0 if sticky else auto_dismiss,
+        "sticky": bool(sticky),
+        "expires_at": time.time() + float(expires) if expires else None,
+        "state": state,
+    }
+    return item
+
+
+def _queue_summary(item):
+    """Public view of a queue item"""
+    content = item["state"].get("content") or {}
+    return {
+        "id": item["id"],
+        "type": item["type"],
+        "priority": item["priority"],
+        "title": item["state"].get("title"),
+        "message": content.get("message") or content.get("name") or content.get("event"),
+        "duration": item["duration"],
+        "sticky": item["sticky"],
+        "expires_in": round(item["expires_at"] - time.time()) if item["expires_at"] else None,
+    }
+
+def _drop_expired():
+    """Remove waiting items past their expiry (caller holds state_changed)"""
+    now = time.time()
+    message_queue[:] = [i for i in message_queue if not i["expires_at"] or i["expires_at"] > now]
+
+def show_message(item):
+    """Put a queue item on screen and schedule its end (caller holds state_changed)"""
+    global pending_dismiss
+    content = item["state"].get("content")
+    if isinstance(content, dict):
+        # Lets the page clear exactly this message, not whatever replaced it
+        content["queue_id"] = item["id"]
+    set_display_state({**item["state"], "updated": datetime.now().isoformat()}, message=item)
+    if item["duration"] > 0:
+        pending_dismiss = scheduler.schedule(item["duration"], advance_queue, item["id"])
+    elif not item["sticky"] and message_queue:
+        pending_dismiss = scheduler.schedule(ROTATE_SECONDS, advance_queue, item["id"], True)
+
+def enqueue_message(item):
+    """Show item now if it outranks the current message, otherwise queue it.
     
-    logger.info(f"Message sent: type={message_type}, sticky={sticky}, auto_dismiss={auto_dismiss}")
+    Returns the id of a waiting item dropped to keep the queue bounded, or None.
+    Caller holds state_changed.
+    """
+    global pending_dismiss
+    _drop_expired()
+    if current_message is None or item["priority"] > current_message["priority"]:
+        if current_message is not None:
+            # Preempted: resume it after the new message
+            message_queue.insert(0, current_message)
+        show_message(item)
+    else:
+        pos = next((i for i, waiting in enumerate(message_queue) if waiting["priority"] < item["priority"]),
+                   len(message_queue))
+        message_queue.insert(pos, item)
+        # A message that stays up until cleared now has to give way in turn
+        if not current_message["duration"] and not current_message["sticky"] and pending_dismiss is None:
+            pending_dismiss = scheduler.schedule(ROTATE_SECONDS, advance_queue, current_message["id"], True)
+    if len(message_queue) > MESSAGE_QUEUE_SIZE:
+        return message_queue.pop()["id"]
+    return None
+
+def advance_queue(item_id=None, requeue=False):
+    """End the current message and show the next one, or quickglance when the queue is empty.
     
-    # Schedule auto-dismiss if needed
-    if auto_dismiss > 0 and not sticky:
-        threading.Timer(auto_dismiss, auto_dismiss_message).start()
+    item_id guards against ending a message that has already been replaced;
+    requeue puts the current message at the back of the queue (rotation).
+    """
+    global current_message, pending_dismiss, resume_token
+    with state_changed:
+        if item_id is not None and (current_message is None or current_message["id"] != item_id):
+            return False
+        # This may be the pending job itself running, or an early clear superseding it
+        if pending_dismiss is not None:
+            scheduler.cancel(pending_dismiss)
+            pending_dismiss = resume_token = None
+        if requeue and current_message is not None:
+            message_queue.append(current_message)
+        current_message = None
+        _drop_expired()
+        if message_queue:
+            show_message(message_queue.pop(0))
+        else:
+            logger.info("Message queue empty, returning to quickglance")
+            set_display_state({
+                "mode": "quickglance",
+                "title": "Quick Look",
+                "content": quickglance_content,
+                "updated": datetime.now().isoformat()
+            })
+        return True
+
+def resume_queue(token):
+    """Scheduled job: show waiting messages again after a non-message state displaced them.
     
-    return jsonify({"success": True, "state": display_state})
+    Does nothing if the queue has moved on since it was scheduled (a skip, a clear
+    or a new message), so a job that was already running can't advance it twice.
+    """
+    with state_changed:
+        if token is not resume_token or current_message is not None:
+            return False
+        return advance_queue()
 
+@app.route('/api/queue')
+def queue_status():
+    """Current message and the messages waiting behind it"""
+    with state_changed:
+        _drop_expired()
+        return jsonify({
+            "current": _queue_summary(current_message) if current_message else None,
+            "pending": [_queue_summary(i) for i in message_queue],
+        })
 
-def auto_dismiss_message():
-    """Auto-return to quickglance after message timeout"""
-    global display_state, quickglance_content
-    if display_state.get("mode") == "message":
-        logger.info("Auto-dismissing message, returning to quickglance")
-        display_state["mode"] = "quickglance"
-        display_state["title"] = "Quick Look"
-        display_state["content"] = quickglance_content
-        display_state["updated"] = datetime.now().isoformat()
+@app.route('/api/queue/<int:item_id>', methods=['DELETE'])
+def queue_drop(item_id):
+    """Drop a message: ends it if on screen, otherwise removes it from the queue"""
+    with state_changed:
+        if current_message is not None and current_message["id"] == item_id:
+            advance_queue(item_id)
+            return jsonify({"success": True, "dropped": item_id})
+        for i, item in enumerate(message_queue):
+            if item["id"] == item_id:
+                del message_queue[i]
+                return jsonify({"success": True, "dropped": item_id})
+    return jsonify({"error": "No such message"}), 404
+
+@app.route('/api/queue/order', methods=['POST'])
+def queue_reorder():
+    """Reorder waiting messages: {"order": [id, ...]}; unlisted ids keep their order after these"""
+    order = (request.json or {}).get("order", [])
+    with state_changed:
+        by_id = {item["id"]: item for item in message_queue}
+        front = [by_id.pop(i) for i in order if i in by_id]
+        message_queue[:] = front + [item for item in message_queue if item["id"] in by_id]
+        return jsonify({"success": True, "pending": [_queue_summary(i) for i in message_queue]})
 
 
 def get_type_color(message_type):
@@ -315,31 +994,41 @@ def get_type_color(message_type):
 
 @app.route('/api/clear-message', methods=['POST'])
 def clear_message():
-    """Clear the current message and return to quickglance, restoring saved content"""
-    global display_state, quickglance_content
-    display_state = {
-        "mode": "quickglance",
-        "title": "Quick Look",
-        "content": quickglance_content,
-        "updated": datetime.now().isoformat()
-    }
-    logger.info("Message cleared, returning to quickglance with restored content")
-    return jsonify({"success": True, "state": display_state})
+    """Clear the current message and show the next queued one, or quickglance with restored content
+    
+    Optional body {"id": <queue id>} only clears if that message is still on screen.
+    """
+    item_id = (request.get_json(silent=True) or {}).get("id")
+    with state_changed:
+        cleared = clear_current_message(item_id)
+        state = display_state
+    return jsonify({"success": True, "cleared": cleared, "state": state})
+
+def clear_current_message(item_id=None):
+    """End the current message (only if it is item_id, when given); False if nothing was cleared"""
+    with state_changed:
+        if item_id is not None and (current_message is None or current_message["id"] != item_id):
+            return False
+        # Shows the next waiting message, or quickglance when there is none
+        advance_queue()
+    logger.info("Message cleared")
+    return True
 
 @app.route('/api/reload-templates', methods=['POST'])
 def reload_templates():
-    """Force reload of Jinja2 templates"""
-    from flask import Flask
-    app.jinja_env.cache.clear()
+    """Recompile every template (only needed after editing template files by hand)"""
+    templates_changed()
     return jsonify({"success": True, "message": "Templates reloaded"})
 
 @app.route('/api/restart', methods=['POST'])
 def restart_receiver():
-    """Restart the receiver (for template updates to take effect)"""
+    """Restart the receiver (template uploads no longer need this)"""
     import os
     import subprocess
-    # Spawn new process and exit current
-    subprocess.Popen(['python3', os.path.abspath(__file__)])
+    # Make sure the new process restores the latest state
+    save_snapshot()
+    # Spawn new process (same serve mode/options) and exit current
+    subprocess.Popen(['python3', os.path.abspath(__file__)] + sys.argv[1:])
     return jsonify({"success": True, "message": "Restarting..."})
 
 if __name__ == '__main__':
@@ -350,47 +1039,246 @@ if __name__ == '__main__':
 # Config API endpoints - must be after app is defined
 @app.route('/api/config', methods=['GET', 'POST'])
 def config_endpoint():
-    global config
     if request.method == 'POST':
-        config.update(request.json)
-        save_config(config)
+        update_config(request.json)
         return jsonify({"success": True, "config": config})
     return jsonify(config)
 
-# Fetch data on startup
-def fetch_on_startup():
-    """Fetch fresh data when receiver starts"""
-    import subprocess
-    import os
-    try:
-        logger.info("Fetching data on startup...")
-        # Use absolute path to ensure it works when called from any directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        env = os.environ.copy()
-        env['PATH'] = env.get('PATH', '') + ':/home/ccampos/bin:/usr/local/bin'
-        result = subprocess.run(
-            ['python3', 'fetch_data.py'],
-            cwd=script_dir,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            env=env
-        )
-        if result.returncode == 0:
-            logger.info("Startup data fetch successful")
+def update_config(changes):
+    """Merge changes into the config, save it and publish a new version so displays reload"""
+    global config_version, config_modified, batch_changed
+    with state_changed:
+        config.update(changes)
+        save_config(config)
+        config_version += 1
+        config_modified = datetime.now(timezone.utc)
+        invalidate_pages()
+        if batch_changed is not None:
+            batch_changed = True
         else:
-            logger.error(f"Startup fetch failed: {result.stderr}")
-    except Exception as e:
-        logger.error(f"Error fetching on startup: {e}")
+            publish_state()
 
-if __name__ == "__main__":
-    # Run startup fetch in background thread so it doesn't block server start
-    def background_fetch():
-        import time
-        time.sleep(2)  # Wait for server to start
-        fetch_on_startup()
+# Production serving: gzip for HTML/JSON and long-lived caching for fingerprinted /static URLs
+# (both off under the dev server; --serve production turns them on)
+app.config['COMPRESS_RESPONSES'] = False
+COMPRESS_MIN_SIZE = 500
+COMPRESS_LEVEL = 6
+COMPRESS_MIMETYPES = {"text/html", "text/css", "application/json", "application/javascript",
+                      "application/manifest+json", "image/svg+xml"}
+# Compressed bodies of ETagged responses, so an unchanged page/status isn't gzipped per poll
+GZIP_CACHE_SIZE = 8
+# Appended to a resource's ETag for its gzip body
+GZIP_ETAG_SUFFIX = "-gz"
+gzip_cache = OrderedDict()
+gzip_cache_lock = threading.Lock()
+STATIC_MAX_AGE = 365 * 24 * 3600
+_static_hashes = {}
+
+def static_url(filename):
+    """URL for a /static file with a content hash, so it can be cached until the file changes"""
+    path = os.path.join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return url_for('static', filename=filename)
+    cached = _static_hashes.get(filename)
+    if not cached or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = (mtime, hashlib.sha1(f.read()).hexdigest()[:10])
+        _static_hashes[filename] = cached
+    return url_for('static', filename=filename, v=cached[1])
+
+app.jinja_env.globals['static_url'] = static_url
+
+def wants_gzip():
+    """Whether this response will be gzipped (production serving and a client that accepts it)"""
+    return app.config['COMPRESS_RESPONSES'] and 'gzip' in request.accept_encodings
+
+def compress_body(resp):
+    """gzip a response body, reusing the last result for the same ETag"""
+    etag = resp.get_etag()[0]
+    key = (request.path, etag) if etag else None
+    if key:
+        with gzip_cache_lock:
+            body = gzip_cache.get(key)
+            if body is not None:
+                gzip_cache.move_to_end(key)
+                return body
+    body = gzip.compress(resp.get_data(), COMPRESS_LEVEL)
+    if key:
+        with gzip_cache_lock:
+            gzip_cache[key] = body
+            while len(gzip_cache) > GZIP_CACHE_SIZE:
+                gzip_cache.popitem(last=False)
+    return body
+
+@app.after_request
+def production_headers(resp):
+    """Cache headers for /static and gzip for text responses"""
+    if request.endpoint == 'static' and request.args.get('v'):
+        resp.cache_control.public = True
+        resp.cache_control.max_age = STATIC_MAX_AGE
+        resp.cache_control.immutable = True
+        resp.cache_control.no_cache = None
+    # Only text types (never the SSE stream)
+    if not app.config['COMPRESS_RESPONSES'] or resp.mimetype not in COMPRESS_MIMETYPES:
+        return resp
+    # Body and ETag depend on Accept-Encoding, 304s included
+    resp.vary.add('Accept-Encoding')
+    # Only full 200 bodies (a 304 has none)
+    if resp.status_code != 200 or 'Content-Encoding' in resp.headers or not wants_gzip():
+        return resp
+    # send_file streams from disk; the static files here are small, so read them in
+    resp.direct_passthrough = False
+    if resp.content_length is not None and resp.content_length < COMPRESS_MIN_SIZE:
+        return resp
+    etag, weak = resp.get_etag()
+    resp.set_data(compress_body(resp))
+    resp.headers['Content-Encoding'] = 'gzip'
+    if etag and not etag.endswith(GZIP_ETAG_SUFFIX):
+        resp.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+    return resp
+
+BATCH_OPS = ("update", "message", "clear_message", "config")
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Apply several operations as one state transition
+    
+    Request body (JSON):
+    {
+        "operations": [
+            {"op": "update", "mode": "quickglance", "content": {...}},  # same fields as /api/update
+            {"op": "message", "message": "Dinner!", "type": "info"},    # same fields as /api/message
+            {"op": "config", "font_scale": 1.2},                        # same fields as /api/config
+            {"op": "clear_message", "id": 3}                            # same as /api/clear-message
+        ]
+    }
+    Operations run in order under the state lock, so the display never sees the
+    states in between; the result is published as one new version. An If-Match
+    header applies to the whole batch. Nothing is applied if any operation is malformed.
+    """
+    global batch_changed
+    operations = (request.get_json(silent=True) or {}).get("operations")
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    messages = {}
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict) or op.get("op") not in BATCH_OPS:
+            return jsonify({"error": f"operation {i}: op must be one of {', '.join(BATCH_OPS)}"}), 400
+        if op["op"] == "message":
+            try:
+                messages[i] = build_message({k: v for k, v in op.items() if k != "op"})
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": f"operation {i}: {e}"}), 400
     
-    fetch_thread = threading.Thread(target=background_fetch, daemon=True)
-    fetch_thread.start()
+    mark_push()
+    results = []
+    with state_changed:
+        if request.if_match and not request.if_match.contains(f"{BOOT_ID}-s{state_version}"):
+            return jsonify({"error": "State changed", "version": state_version}), 412
+        batch_changed = False
+        try:
+            for i, op in enumerate(operations):
+                fields = {k: v for k, v in op.items() if k != "op"}
+                if op["op"] == "update":
+                    result, _ = apply_update(fields)
+                    results.append({"op": "update", "changed": result["changed"],
+                                    "deferred": result.get("deferred", False)})
+                elif op["op"] == "message":
+                    item = messages[i]
+                    dropped = enqueue_message(item)
+                    results.append({"op": "message", "id": item["id"], "showing": current_message is item,
+                                    "dropped": dropped})
+                elif op["op"] == "clear_message":
+                    results.append({"op": "clear_message", "cleared": clear_current_message(fields.get("id"))})
+                elif op["op"] == "config":
+                    update_config(fields)
+                    results.append({"op": "config"})
+        finally:
+            changed = batch_changed
+            batch_changed = None
+        version = publish_state() if changed else state_version
+        state = display_state
+    
+    logger.info(f"Batch applied: {len(operations)} operations, changed={changed}, version={version}")
+    return jsonify({"success": True, "changed": changed, "version": version,
+                    "results": results, "state": state})
+
+# Warm-start fetch: run the fetch_data pipeline in-process instead of shelling out
+# starting -> warming (cached data applied) -> ready (live refresh applied)
+warm_state = {"status": "starting", "error": None, "finished": None}
+
+def apply_fetch(fetch_data, snapshot):
+    """Apply quickglance from a fetch snapshot, queueing a popup if one is due"""
+    data = fetch_data.build_quickglance(snapshot)
+    should_popup, popup_data = fetch_data.check_popup_routines(snapshot)
+    if should_popup and popup_data:
+        # Popups are queued messages, so they respect priority like any other
+        with state_changed:
+            enqueue_message(build_message(fetch_data.popup_payload(popup_data)))
+    # Saved for after the popup if one is on screen
+    apply_update(fetch_data.quickglance_payload(data))
+
+def warm_fetch():
+    """Show cached data right away, then refresh every source live"""
+    warm_state["status"] = "warming"
+    try:
+        import fetch_data
+        if not boot_stats["restored"]:
+            # Nothing restored from the snapshot: put up whatever the fetch cache has without waiting
+            apply_fetch(fetch_data, fetch_data.build_snapshot(deadline=0))
+        logger.info("Warm start: refreshing sources...")
+        apply_fetch(fetch_data, fetch_data.build_snapshot(use_cache=False))
+        logger.info("Warm start: live data applied")
+    except Exception as e:
+        warm_state["error"] = str(e)
+        logger.error(f"Warm start fetch failed: {e}")
+    warm_state["finished"] = datetime.now().isoformat()
+    warm_state["status"] = "ready"
+
+def start_warm_fetch():
+    """Run warm_fetch on a background thread so it doesn't block serving"""
+    threading.Thread(target=warm_fetch, name="warm-fetch", daemon=True).start()
+
+def serve_production(host, port, threads, connection_limit, keepalive):
+    """Serve with waitress (multi-threaded, HTTP/1.1 keep-alive) plus gzip and static caching.
     
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    One process only: display_state, the message queue and SSE listeners live in memory.
+    """
+    app.config['COMPRESS_RESPONSES'] = True
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.error("waitress is not installed (pip install waitress); using the threaded Werkzeug server")
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    logger.info(f"Serving with waitress on {host}:{port} ({threads} threads)")
+    # Each open /api/stream holds a thread; send_bytes=1 flushes SSE events as they're written
+    serve(app, host=host, port=port, threads=threads, connection_limit=connection_limit,
+          channel_timeout=keepalive, send_bytes=1, ident="dobby-display")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dobby Display receiver")
+    parser.add_argument("--serve", choices=["dev", "production"],
+                        default=os.environ.get("DOBBY_SERVE", "dev"),
+                        help="dev: Flask development server; production: waitress + gzip + static caching")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("DOBBY_THREADS", 6)),
+                        help="Worker threads for --serve production (each open display stream uses one)")
+    parser.add_argument("--connection-limit", type=int, default=50,
+                        help="Max open connections for --serve production")
+    parser.add_argument("--keepalive", type=int, default=120,
+                        help="Seconds an idle keep-alive connection stays open (--serve production)")
+    args = parser.parse_args()
+
+    compile_templates()
+    start_warm_fetch()
+    if args.serve == "production":
+        serve_production(args.host, args.port, args.threads, args.connection_limit, args.keepalive)
+    else:
+        app.run(host=args.host, port=args.port, debug=False)
+
+if __name__ == "__main__":
+    main()
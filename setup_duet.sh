@@ -22,9 +22,9 @@ fi
 # Install Python dependencies (use apt for externally-managed systems)
 echo "📦 Installing Python dependencies..."
 if command -v apt &> /dev/null; then
-    sudo apt install python3-flask python3-requests
+    sudo apt install python3-flask python3-requests python3-waitress
 else
-    pip3 install --user --break-system-packages flask requests
+    pip3 install --user --break-system-packages flask requests waitress
 fi
 
 # Install Tailscale if not present
@@ -43,7 +43,7 @@ cat > start_display.sh << 'EOF'
 cd ~/dobby_display
 echo "🚀 Starting Dobby Display on http://localhost:5000"
 echo "Press Ctrl+C to stop"
-python3 receiver.py
+python3 receiver.py --serve production
 EOF
 
 chmod +x start_display.sh
@@ -2,4 +2,4 @@
 cd ~/dobby_display
 echo "🚀 Starting Dobby Display on http://localhost:5000"
 echo "Press Ctrl+C to stop"
-python3 receiver.py
+python3 receiver.py --serve production